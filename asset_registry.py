@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import pygame
+
+# Resolved SysFont lookups, kept between runs
+FONT_CACHE_PATH = "font_cache.json"
+
+_NULL_PHASE = nullcontext()
+
+
+class _Phase:
+    """Timing context for one startup phase"""
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StartupTrace:
+    """Wall time spent in each init phase, printed once startup is done.
+
+    Disabled, ``phase`` hands back a shared no-op context. ``finish``
+    prints the table (plus the total since the trace was created);
+    phases recorded after that, such as background sound loading, print
+    as they complete.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.created = time.perf_counter()
+        self.phases = []
+        self.reported = False
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def mark(self, name):
+        """Record the time since the trace was created, e.g. for module imports"""
+        if self.enabled:
+            self.record(name, time.perf_counter() - self.created)
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        self.phases.append((name, seconds))
+        if self.reported:
+            print(f"  {name:<28}{seconds * 1000:>9.1f} ms")
+
+    def finish(self):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print("Startup trace:")
+        for name, seconds in self.phases:
+            print(f"  {name:<28}{seconds * 1000:>9.1f} ms")
+        print(f"  {'total':<28}{(time.perf_counter() - self.created) * 1000:>9.1f} ms")
+
+
+def init_pygame():
+    """Initialise pygame on first use rather than at import time"""
+    if pygame.get_init():
+        return
+    with trace.phase("pygame.init"):
+        pygame.mixer.pre_init(44100, -16, 2, 512)
+        pygame.init()
+
+
+class AssetRegistry:
+    """Fonts and sounds, loaded on first use and shared by everything.
+
+    ``font`` resolves a SysFont name once: pygame scans the system font
+    database on the first lookup, which is slow on kiosk machines, so the
+    resolved file path (and whether bold/italic must be synthesised) is
+    saved to ``font_cache_path`` and reused next run. A cached path that
+    no longer exists is looked up again; delete the file after
+    installing fonts. Font objects are shared per name, size and style.
+
+    ``load_sounds`` decodes WAV files on a background thread, handing each
+    Sound over as it is ready; decoded sounds are kept for later callers.
+    """
+
+    def __init__(self, font_cache_path=FONT_CACHE_PATH):
+        self.font_cache_path = font_cache_path
+        self.font_paths = None
+        self.fonts = {}
+        self.sounds = {}
+        self.sound_lock = threading.Lock()
+        self.sound_threads = []
+
+    def font(self, name, size, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            init_pygame()
+            path, set_bold, set_italic = self.resolve_font(name, bold, italic)
+            font = pygame.font.Font(path, size)
+            if set_bold:
+                font.set_bold(True)
+            if set_italic:
+                font.set_italic(True)
+            self.fonts[key] = font
+        return font
+
+    def resolve_font(self, name, bold, italic):
+        """(path or None for pygame's default, synthetic bold, synthetic italic)"""
+        if self.font_paths is None:
+            self.load_font_cache()
+        key = f"{name}|{int(bold)}|{int(italic)}"
+        entry = self.font_paths.get(key)
+        if entry is None or (entry[0] is not None and not os.path.exists(entry[0])):
+            # Same resolution as SysFont, capturing what it would construct
+            entry = pygame.font.SysFont(name, 0, bold, italic,
+                                        constructor=lambda path, size, b, i: [path, b, i])
+            self.font_paths[key] = entry
+            self.save_font_cache()
+        return entry
+
+    def load_font_cache(self):
+        try:
+            with open(self.font_cache_path, "r") as f:
+                self.font_paths = json.load(f)
+        except (IOError, ValueError):
+            self.font_paths = {}
+
+    def save_font_cache(self):
+        tmp_path = self.font_cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.font_paths, f, indent=1)
+            os.replace(tmp_path, self.font_cache_path)
+        except IOError as e:
+            print(f"Error saving font cache: {e}")
+
+    def load_sounds(self, files, on_load):
+        """Decode ``files`` ({key: path}) off the main thread, calling ``on_load(key, sound)``"""
+        thread = threading.Thread(target=self.decode_sounds, args=(files, on_load),
+                                  name="sound-loader", daemon=True)
+        self.sound_threads.append(thread)
+        thread.start()
+        return thread
+
+    def decode_sounds(self, files, on_load):
+        start = time.perf_counter()
+        for key, path in files.items():
+            with self.sound_lock:
+                sound = self.sounds.get(path)
+                if sound is None:
+                    if not os.path.exists(path):
+                        print(f"Sound file missing: {path}")
+                        continue
+                    try:
+                        sound = self.sounds[path] = pygame.mixer.Sound(path)
+                    except pygame.error as e:
+                        print(f"Error loading {os.path.basename(path)}: {e}")
+                        continue
+            on_load(key, sound)
+        trace.record("sounds (background)", time.perf_counter() - start)
+
+    def wait_sounds(self):
+        """Block until every background sound load has finished"""
+        for thread in self.sound_threads:
+            thread.join()
+        self.sound_threads = []
+
+
+# Enabled with --trace-startup
+trace = StartupTrace()
+
+# Shared by the game, entities and tools
+assets = AssetRegistry()
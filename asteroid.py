@@ -1,49 +1,78 @@
 import pygame
 import random
 import math
+import itertools
+from collections import OrderedDict
+from stamps import stamps
+from timestep import lerp_position
+from pool import Pool
+from quality import quality
+
+SPRITE_COLORKEY = (0, 0, 0)
+_shape_keys = itertools.count()
 
 class Asteroid:
+    __slots__ = ("pos", "prev_pos", "size", "radius", "speed", "angle", "rotation_speed",
+                 "vertices_count", "offsets", "rect", "point_value", "inner_detail_points",
+                 "color_variation", "glow_pulse", "shape_key")
+
     def __init__(self, x, y, size):
-        self.pos = pygame.Vector2(x, y)
+        self.pos = pygame.Vector2()
+        self.prev_pos = pygame.Vector2()
+        self.speed = pygame.Vector2()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.offsets = []
+        self.inner_detail_points = []
+        self.reset(x, y, size)
+
+    def reset(self, x, y, size):
+        """Re-initialise in place, with a new shape, for reuse from ``asteroid_pool``"""
+        self.pos.update(x, y)
+        self.prev_pos.update(x, y)
         self.size = size
         self.radius = {3: 40, 2: 25, 1: 15}[size]
-        self.speed = pygame.Vector2(random.uniform(-2, 2), random.uniform(-2, 2))
+        self.speed.update(random.uniform(-2, 2), random.uniform(-2, 2))
         self.angle = random.uniform(0, 360)
         self.rotation_speed = random.uniform(-3, 3)
         self.vertices_count = random.randint(8, 14)
-        self.offsets = [random.uniform(0.7, 1.3) for _ in range(self.vertices_count)]
-        self.rect = pygame.Rect(0, 0, self.radius*2, self.radius*2)
+        self.offsets[:] = [random.uniform(0.7, 1.3) for _ in range(self.vertices_count)]
+        self.rect.size = (self.radius*2, self.radius*2)
         self.update_rect()
         self.point_value = {3: 20, 2: 50, 1: 100}[size]
         
         # Advanced visual features
-        self.inner_detail_points = []
+        self.inner_detail_points.clear()
         self.generate_inner_details()
         self.color_variation = random.randint(-30, 30)
         self.glow_pulse = random.uniform(0, 360)
+        self.shape_key = next(_shape_keys)
+
+    def __setstate__(self, state):
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        # Sprite cache keys are per process; an unpickled asteroid takes a fresh one
+        self.shape_key = next(_shape_keys)
+        asteroid_pool.adopt()
 
     def generate_inner_details(self):
-        """Generate crater-like details inside asteroid"""
+        """Generate crater-like details inside asteroid as (angle, distance, size)"""
         crater_count = random.randint(2, 5)
         for _ in range(crater_count):
             angle = random.uniform(0, 2 * math.pi)
             distance = random.uniform(0, self.radius * 0.5)
             crater_size = random.randint(2, 5)
-            self.inner_detail_points.append({
-                'angle': angle,
-                'distance': distance,
-                'size': crater_size
-            })
+            self.inner_detail_points.append((angle, distance, crater_size))
 
     def update_rect(self):
         self.rect.center = (int(self.pos.x), int(self.pos.y))
 
-    def update(self):
+    def update(self, bounds):
+        self.prev_pos.update(self.pos)
         self.pos += self.speed
         self.angle = (self.angle + self.rotation_speed) % 360
         self.glow_pulse = (self.glow_pulse + 2) % 360
         
-        screen_width, screen_height = pygame.display.get_surface().get_size()
+        screen_width, screen_height = bounds
         if self.pos.x < -self.radius:
             self.pos.x = screen_width + self.radius
         elif self.pos.x > screen_width + self.radius:
@@ -54,46 +83,151 @@ class Asteroid:
             self.pos.y = -self.radius
         self.update_rect()
 
-    def draw(self, screen):
+    def render_body(self, angle, scale=1.0):
+        """Render outline, fill and craters at a rotation into a colorkeyed sprite"""
+        radius = self.radius * scale
+        extent = math.ceil(radius * max(self.offsets)) + 3
+        surf = pygame.Surface((extent * 2, extent * 2))
+        surf.fill(SPRITE_COLORKEY)
+        
         # Calculate outer polygon points
         points = []
         angle_between_vertices = 2 * math.pi / self.vertices_count
         for i in range(self.vertices_count):
-            angle_vertex = angle_between_vertices * i + math.radians(self.angle)
-            rad = self.radius * self.offsets[i]
-            x = self.pos.x + rad * math.cos(angle_vertex)
-            y = self.pos.y + rad * math.sin(angle_vertex)
+            angle_vertex = angle_between_vertices * i + math.radians(angle)
+            rad = radius * self.offsets[i]
+            x = extent + rad * math.cos(angle_vertex)
+            y = extent + rad * math.sin(angle_vertex)
             points.append((x, y))
         
-        # Draw subtle glow effect
-        glow_intensity = 20 + int(10 * math.sin(math.radians(self.glow_pulse)))
-        glow_color = (150 + glow_intensity, 150 + glow_intensity, 150 + glow_intensity)
-        glow_surface = pygame.Surface((self.radius * 3, self.radius * 3), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (*glow_color, 30), 
-                          (int(self.radius * 1.5), int(self.radius * 1.5)), 
-                          int(self.radius * 1.2))
-        screen.blit(glow_surface, 
-                   (self.pos.x - self.radius * 1.5, self.pos.y - self.radius * 1.5),
-                   special_flags=pygame.BLEND_ADD)
-        
         # Draw filled polygon with color variation
         base_color = 180 + self.color_variation
         fill_color = (base_color, base_color, base_color)
-        pygame.draw.polygon(screen, fill_color, points)
+        pygame.draw.polygon(surf, fill_color, points)
         
         # Draw outline with slight color gradient
         outline_color = (220, 220, 220)
-        pygame.draw.polygon(screen, outline_color, points, 3)
+        pygame.draw.polygon(surf, outline_color, points, max(1, round(3 * scale)))
         
         # Draw inner crater details
-        for detail in self.inner_detail_points:
-            detail_angle = detail['angle'] + math.radians(self.angle)
-            detail_x = self.pos.x + detail['distance'] * math.cos(detail_angle)
-            detail_y = self.pos.y + detail['distance'] * math.sin(detail_angle)
-            pygame.draw.circle(screen, (100, 100, 100), 
-                             (int(detail_x), int(detail_y)), detail['size'])
-            pygame.draw.circle(screen, (140, 140, 140), 
-                             (int(detail_x), int(detail_y)), detail['size'], 1)
+        craters = self.inner_detail_points if quality.asteroid_detail else ()
+        for detail_angle, distance, crater_size in craters:
+            detail_angle += math.radians(angle)
+            distance *= scale
+            crater_size = max(1, round(crater_size * scale))
+            detail_x = extent + distance * math.cos(detail_angle)
+            detail_y = extent + distance * math.sin(detail_angle)
+            pygame.draw.circle(surf, (100, 100, 100), 
+                             (int(detail_x), int(detail_y)), crater_size)
+            pygame.draw.circle(surf, (140, 140, 140), 
+                             (int(detail_x), int(detail_y)), crater_size, 1)
+        
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+        return surf
+
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        pos = lerp_position(self.prev_pos, self.pos, alpha) * scale
+        
+        # Body is a single blit of the nearest pre-rendered rotation frame,
+        # rendered at the sprite cache's scale (kept in step by the manager)
+        body = sprites.frame(self)
+        body_rect = body.get_rect(center=(int(pos.x), int(pos.y)))
+        if not quality.asteroid_detail:
+            return screen.blit(body, body_rect)
+        
+        # Draw subtle glow effect
+        glow_intensity = 20 + int(10 * math.sin(math.radians(self.glow_pulse)))
+        glow_color = (150 + glow_intensity, 150 + glow_intensity, 150 + glow_intensity)
+        glow_radius = int(self.radius * 1.2 * scale)
+        glow_surface = stamps.get(glow_radius, glow_color, 30)
+        glow_rect = screen.blit(glow_surface, 
+                   (pos.x - glow_radius, pos.y - glow_radius),
+                   special_flags=pygame.BLEND_ADD)
+        return glow_rect.union(screen.blit(body, body_rect))
+
+
+class AsteroidSpriteCache:
+    """Pre-rendered rotation frames for every asteroid shape"""
+
+    def __init__(self, angle_step=6, max_bytes=64 * 1024 * 1024):
+        self.angle_step = angle_step
+        self.frame_count = max(1, round(360 / angle_step))
+        self.max_bytes = max_bytes
+        self.shapes = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.scale = 1.0
+        self.detail = True
+
+    def set_scale(self, scale):
+        # Frames are rendered at the render target's size relative to the world;
+        # a new scale drops every cached frame
+        if scale != self.scale:
+            self.scale = scale
+            self.clear()
+
+    def set_detail(self, detail):
+        # Frames have craters baked in (or not), so a change drops them too
+        if detail != self.detail:
+            self.detail = detail
+            self.clear()
+
+    def frame(self, asteroid):
+        # Rendered lazily into 360 / angle_step frames; drawing blits the nearest one
+        key = asteroid.shape_key
+        entry = self.shapes.get(key)
+        if entry is None:
+            entry = self.shapes[key] = [0, [None] * self.frame_count]
+        else:
+            self.shapes.move_to_end(key)
+
+        index = round(asteroid.angle * self.frame_count / 360) % self.frame_count
+        frames = entry[1]
+        surf = frames[index]
+        if surf is not None:
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = frames[index] = asteroid.render_body(index * 360 / self.frame_count, self.scale)
+        size = surf.get_width() * surf.get_height() * 4
+        entry[0] += size
+        self.bytes += size
+        # Evict least recently used shapes once past max_bytes (destroyed ones go in discard)
+        while self.bytes > self.max_bytes and len(self.shapes) > 1:
+            old_key, (old_bytes, _) = self.shapes.popitem(last=False)
+            self.bytes -= old_bytes
+            self.evictions += 1
+        return surf
+
+    def discard(self, asteroid):
+        entry = self.shapes.pop(asteroid.shape_key, None)
+        if entry is not None:
+            self.bytes -= entry[0]
+
+    def clear(self):
+        self.shapes.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "shapes": len(self.shapes),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every AsteroidManager
+sprites = AsteroidSpriteCache()
+asteroid_pool = Pool(Asteroid, "asteroids")
 
 
 class AsteroidManager:
@@ -105,7 +239,7 @@ class AsteroidManager:
         self.spawn_interval = 180
 
     def spawn_initial(self, count=5):
-        self.asteroids.clear()
+        self.clear()
         for _ in range(count):
             side = random.choice(['left', 'right', 'top', 'bottom'])
             if side == 'left':
@@ -116,11 +250,11 @@ class AsteroidManager:
                 x, y = random.uniform(0, self.screen_width), -50
             else:
                 x, y = random.uniform(0, self.screen_width), self.screen_height + 50
-            self.asteroids.append(Asteroid(x, y, 3))
+            self.asteroids.append(asteroid_pool.acquire(x, y, 3))
 
-    def update(self):
+    def update(self, bounds):
         for asteroid in self.asteroids:
-            asteroid.update()
+            asteroid.update(bounds)
         
         # Spawn new asteroids periodically
         self.spawn_timer += 1
@@ -135,20 +269,33 @@ class AsteroidManager:
                 x, y = random.uniform(0, self.screen_width), -50
             else:
                 x, y = random.uniform(0, self.screen_width), self.screen_height + 50
-            self.asteroids.append(Asteroid(x, y, random.choice([3, 2])))
+            self.asteroids.append(asteroid_pool.acquire(x, y, random.choice([3, 2])))
 
-    def draw(self, screen):
-        for asteroid in self.asteroids:
-            asteroid.draw(screen)
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        sprites.set_scale(scale)
+        return [asteroid.draw(screen, alpha, scale) for asteroid in self.asteroids]
 
     def destroy(self, asteroid):
+        """Remove an asteroid, splitting it in two; returns the fragments"""
+        fragments = []
         if asteroid.size > 1:
             for _ in range(2):
                 new_size = asteroid.size - 1
                 offset_x = random.uniform(-20, 20)
                 offset_y = random.uniform(-20, 20)
-                new_asteroid = Asteroid(asteroid.pos.x + offset_x, 
-                                      asteroid.pos.y + offset_y, new_size)
+                new_asteroid = asteroid_pool.acquire(asteroid.pos.x + offset_x, 
+                                                     asteroid.pos.y + offset_y, new_size)
                 self.asteroids.append(new_asteroid)
+                fragments.append(new_asteroid)
         if asteroid in self.asteroids:
             self.asteroids.remove(asteroid)
+            asteroid_pool.release(asteroid)
+        sprites.discard(asteroid)
+        return fragments
+
+    def clear(self):
+        """Return every asteroid to the pool"""
+        for asteroid in self.asteroids:
+            sprites.discard(asteroid)
+        asteroid_pool.release_all(self.asteroids)
+        self.asteroids.clear()
@@ -0,0 +1,388 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+import pygame
+
+import main
+from asset_registry import assets, init_pygame
+from asteroid import AsteroidManager, asteroid_pool, sprites
+from bullet import bullet_pool
+from bullet_manager import BulletManager
+from explosion import ExplosionManager
+from leaderboard import open_leaderboard
+from particles import ParticleEngine
+from profiler import FrameProfiler
+from quality import LEVELS, quality
+from stamps import stamps
+from text_cache import text_cache
+
+DEFAULT_RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440)]
+
+# Phases faster than this are noise at perf_counter resolution; never flag them
+MIN_PHASE_MS = 0.05
+
+
+class Scenario(ABC):
+    """One benchmark case: ``setup`` builds the state, ``step`` is one timed frame.
+
+    Steps time their own sub-phases through ``self.profiler``; the runner
+    records the whole step as the "frame" phase.
+    """
+
+    name = "scenario"
+    quality_level = 0
+    # Caps the frame count for scenarios too slow to run the full suite length
+    max_frames = None
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.profiler = FrameProfiler(size=100000, enabled=True)
+
+    def setup(self):
+        init_pygame()
+        random.seed(self.seed)
+        quality.apply(self.quality_level)
+        # Module-level caches carry over between scenarios; start each one cold
+        sprites.clear()
+        stamps.clear()
+        text_cache.clear()
+
+    @abstractmethod
+    def step(self, frame):
+        """Advance and draw one frame"""
+
+    def teardown(self):
+        pass
+
+
+def bench_screen(size):
+    return pygame.display.set_mode(size)
+
+
+class AsteroidScenario(Scenario):
+    def __init__(self, count, size=(1920, 1080), seed=0):
+        super().__init__(seed)
+        self.count = count
+        self.size = size
+        self.name = f"asteroids_{count}"
+
+    def setup(self):
+        super().setup()
+        self.screen = bench_screen(self.size)
+        w, h = self.size
+        self.manager = AsteroidManager(w, h)
+        # Park the spawner; the population stays at exactly ``count``
+        self.manager.spawn_interval = float("inf")
+        for _ in range(self.count):
+            pos = (random.uniform(0, w), random.uniform(0, h))
+            self.manager.asteroids.append(asteroid_pool.acquire(*pos, random.choice([3, 2, 1])))
+
+    def step(self, frame):
+        prof = self.profiler
+        with prof.phase("update"):
+            self.manager.update(self.size)
+        self.screen.fill((0, 0, 0))
+        with prof.phase("draw"):
+            self.manager.draw(self.screen)
+
+    def teardown(self):
+        self.manager.clear()
+
+
+class BulletScenario(Scenario):
+    def __init__(self, count, size=(1920, 1080), seed=0):
+        super().__init__(seed)
+        self.count = count
+        self.size = size
+        self.name = f"bullets_{count}"
+
+    def setup(self):
+        super().setup()
+        self.screen = bench_screen(self.size)
+        self.particles = ParticleEngine(seed=self.seed)
+        self.font = assets.font("Arial", 32, bold=True)
+        self.manager = BulletManager(self.font, particles=self.particles)
+        self.refill()
+
+    def refill(self):
+        w, h = self.size
+        while len(self.manager.bullets) < self.count:
+            angle = random.uniform(0, 2 * np.pi)
+            self.manager.add(bullet_pool.acquire(random.uniform(0, w), random.uniform(0, h),
+                                                 np.cos(angle) * 5, np.sin(angle) * 5))
+
+    def step(self, frame):
+        prof = self.profiler
+        with prof.phase("update"):
+            self.manager.update(self.size)
+            self.refill()
+            self.particles.update()
+        self.screen.fill((0, 0, 0))
+        with prof.phase("draw"):
+            self.manager.draw(self.screen)
+            self.particles.draw(self.screen)
+
+    def teardown(self):
+        self.manager.clear()
+
+
+class ExplosionScenario(Scenario):
+    """K explosions fired together every ``interval`` frames"""
+
+    def __init__(self, count, size=(1920, 1080), interval=30, seed=0):
+        super().__init__(seed)
+        self.count = count
+        self.size = size
+        self.interval = interval
+        self.name = f"explosions_{count}"
+
+    def setup(self):
+        super().setup()
+        self.screen = bench_screen(self.size)
+        self.particles = ParticleEngine(seed=self.seed)
+        self.explosions = ExplosionManager(self.particles)
+
+    def step(self, frame):
+        prof = self.profiler
+        w, h = self.size
+        with prof.phase("emit"):
+            if frame % self.interval == 0:
+                for _ in range(self.count):
+                    pos = pygame.Vector2(random.uniform(0, w), random.uniform(0, h))
+                    self.explosions.create_explosion(pos, random.choice([10, 20, 30]), 'asteroid')
+        with prof.phase("update"):
+            self.particles.update()
+        self.screen.fill((0, 0, 0))
+        with prof.phase("draw"):
+            self.particles.draw(self.screen)
+
+
+class GameFrameScenario(Scenario):
+    """A full ``Game.update_game`` + ``draw_game`` frame with a spinning, firing ship"""
+
+    def __init__(self, size, dirty_rects=False, render_scale=1.0, seed=0):
+        super().__init__(seed)
+        self.size = size
+        self.dirty_rects = dirty_rects
+        self.render_scale = render_scale
+        mode = "_dirty" if dirty_rects else ""
+        if render_scale < 1.0:
+            mode += f"_at{round(render_scale * 100)}"
+        self.name = f"game_{size[0]}x{size[1]}{mode}"
+
+    def setup(self):
+        super().setup()
+        # Game keeps its leaderboard, sounds directory and font cache in the
+        # working directory; run it in a scratch one, away from the real files
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        # Game lays itself out from the module-level screen size; windowed,
+        # since a fullscreen mode snaps to the desktop resolution
+        main.SCREEN_WIDTH, main.SCREEN_HEIGHT = self.size
+        self.game = main.Game(dirty_rects=self.dirty_rects, fullscreen=False, adaptive_quality=False,
+                              render_scale=self.render_scale)
+        self.game.profiler = self.profiler
+        self.game.particles.rng = np.random.default_rng(self.seed)
+        self.game.current_player = "BENCH"
+        # Sounds decode on a background thread; keep it out of the timed frames
+        assets.wait_sounds()
+        self.start_round()
+
+    def start_round(self):
+        self.game.reset_game(record=False)
+        self.game.state = "PLAYING"
+        player = self.game.world.player
+        player.rotating_left = True
+        player.shooting = True
+
+    def step(self, frame):
+        self.game.update_game()
+        if self.game.state != "PLAYING":
+            self.start_round()
+        self.game.draw_game()
+
+    def teardown(self):
+        # Stops the leaderboard's writer thread
+        self.game.leaderboard.close()
+        self.game.sound_manager.stop_all()
+        os.chdir(self.cwd)
+        self.tmpdir.cleanup()
+        super().teardown()
+
+
+class LeaderboardScenario(Scenario):
+    """The per-frame HUD queries plus one game-over rank lookup and insert"""
+
+    max_frames = 50
+
+    def __init__(self, entries, backend="json", seed=0):
+        super().__init__(seed)
+        self.entries = entries
+        self.backend = backend
+        suffix = "" if backend == "json" else f"_{backend}"
+        self.name = f"leaderboard_{entries // 1000}k{suffix}"
+
+    def setup(self):
+        super().setup()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        json_path = os.path.join(self.tmpdir.name, "leaderboard.json")
+        # Filled in one go rather than through 100k add_score calls
+        scores = [{"name": f"player{i}", "score": random.randint(0, 5000),
+                   "timestamp": "2025-01-01 00:00:00"} for i in range(self.entries)]
+        with open(json_path, "w") as f:
+            json.dump(scores, f)
+        db_path = os.path.join(self.tmpdir.name, "leaderboard.db")
+        self.board = open_leaderboard(self.backend, db_path if self.backend == "sqlite" else None, json_path)
+
+    def step(self, frame):
+        prof = self.profiler
+        score = random.randint(0, 5000)
+        with prof.phase("top_scores"):
+            self.board.get_top_scores(5)
+            self.board.get_high_score()
+        with prof.phase("rank"):
+            self.board.get_player_rank("BENCH", score)
+        with prof.phase("add_score"):
+            self.board.add_score("BENCH", score)
+        if frame % 10 == 0:
+            with prof.phase("save"):
+                self.board.save()
+
+    def teardown(self):
+        self.board.close()
+        self.tmpdir.cleanup()
+
+
+def default_scenarios(resolutions=DEFAULT_RESOLUTIONS, seed=0, quality_level=0, render_scales=(1.0,)):
+    scenarios = [
+        AsteroidScenario(15, seed=seed),
+        AsteroidScenario(100, seed=seed),
+        BulletScenario(50, seed=seed),
+        BulletScenario(300, seed=seed),
+        ExplosionScenario(10, seed=seed),
+        ExplosionScenario(50, seed=seed),
+    ]
+    scenarios += [GameFrameScenario(size, render_scale=scale, seed=seed)
+                  for size in resolutions for scale in render_scales]
+    scenarios.append(LeaderboardScenario(100000, seed=seed))
+    scenarios.append(LeaderboardScenario(100000, backend="sqlite", seed=seed))
+    for scenario in scenarios:
+        scenario.quality_level = quality_level
+    return scenarios
+
+
+def run_scenario(scenario, frames, warmup):
+    """Run one scenario and return its frames/sec and per-phase timings"""
+    if scenario.max_frames is not None:
+        frames = min(frames, scenario.max_frames)
+        warmup = min(warmup, scenario.max_frames)
+    scenario.setup()
+    try:
+        prof = scenario.profiler
+        for frame in range(warmup):
+            scenario.step(frame)
+        prof.reset()
+
+        start = time.perf_counter()
+        for frame in range(warmup, warmup + frames):
+            frame_start = time.perf_counter()
+            scenario.step(frame)
+            prof.record("frame", time.perf_counter() - frame_start)
+        elapsed = time.perf_counter() - start
+    finally:
+        scenario.teardown()
+
+    return {
+        "frames": frames,
+        "fps": frames / elapsed if elapsed > 0 else float("inf"),
+        "phases": prof.summary(),
+    }
+
+
+def run_suite(scenarios, frames=300, warmup=30, only=None):
+    results = {}
+    for scenario in scenarios:
+        if only and not any(name in scenario.name for name in only):
+            continue
+        result = results[scenario.name] = run_scenario(scenario, frames, warmup)
+        frame = result["phases"]["frame"]
+        print(f"{scenario.name:<24}{result['fps']:>10.1f} fps"
+              f"{frame['mean']:>9.2f} ms{frame['p99']:>9.2f} ms p99")
+    return results
+
+
+def compare(results, baseline, threshold=0.10):
+    """Regressions of ``results`` against ``baseline``, as printable lines.
+
+    A scenario regresses when its fps drops, or a phase's mean time
+    grows, by more than ``threshold`` (a fraction) of the baseline value.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["fps"] < base["fps"] * (1 - threshold):
+            regressions.append(f"{name}: {base['fps']:.1f} -> {result['fps']:.1f} fps")
+        for phase, stats in result["phases"].items():
+            base_stats = base["phases"].get(phase)
+            if base_stats is None or base_stats["mean"] < MIN_PHASE_MS:
+                continue
+            if stats["mean"] > base_stats["mean"] * (1 + threshold):
+                regressions.append(f"{name}.{phase}: {base_stats['mean']:.3f} -> "
+                                   f"{stats['mean']:.3f} ms mean")
+    return regressions
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scripted benchmark scenarios")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resolutions", type=parse_resolution, nargs="+", default=DEFAULT_RESOLUTIONS,
+                        help="draw_game resolutions, e.g. 1280x720 1920x1080")
+    parser.add_argument("--render-scales", type=float, nargs="+", default=[1.0],
+                        help="internal render scales to run draw_game at, e.g. 1 0.66 0.5")
+    parser.add_argument("--quality", choices=[level["name"] for level in LEVELS], default="high",
+                        help="effect quality level to run every scenario at")
+    parser.add_argument("--only", nargs="+", help="run scenarios whose name contains any of these")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="flag regressions against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown as a fraction of the baseline (default 0.10)")
+    args = parser.parse_args()
+
+    level = [level["name"] for level in LEVELS].index(args.quality)
+    scenarios = default_scenarios(args.resolutions, args.seed, level, args.render_scales)
+    results = run_suite(scenarios, args.frames, args.warmup, args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%}")
+    pygame.quit()
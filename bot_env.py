@@ -0,0 +1,314 @@
+import argparse
+import ctypes
+import math
+import multiprocessing
+import os
+import random
+import time
+from contextlib import contextmanager
+import numpy as np
+from quality import LEVELS, quality
+from replay import apply_input
+from world import World
+
+# Observation layout (float32):
+#   player    x, y, velocity x/y, facing x/y, shot cooldown, lives, time left
+#   asteroids the nearest NEAREST_ASTEROIDS, closest first: offset x/y from
+#             the ship, velocity x/y, radius; all zero for empty slots
+# Positions are fractions of the playfield, everything else roughly -1..1
+PLAYER_FEATURES = 9
+ASTEROID_FEATURES = 5
+NEAREST_ASTEROIDS = 8
+OBS_SIZE = PLAYER_FEATURES + ASTEROID_FEATURES * NEAREST_ASTEROIDS
+
+# Actions are replay input masks: any mix of ROTATE_LEFT, ROTATE_RIGHT, THRUST, SHOOT
+ACTION_COUNT = 16
+
+ASTEROID_MAX_SPEED = 2.0
+ASTEROID_MAX_RADIUS = 40.0
+
+
+class AsteroidEnv:
+    """Gym-style wrapper around a headless World for training bots.
+
+    ``reset`` starts a round and returns its first observation;
+    ``step(action)`` holds an input mask for ``frame_skip`` ticks and
+    returns ``(observation, reward, done, info)``. The reward is the score
+    gained minus ``crash_penalty`` per life lost. Both take ``out``, an
+    OBS_SIZE float32 array to write the observation into.
+
+    Each env keeps its own copy of the global RNG state the simulation
+    uses and swaps it in around every call, so several envs can share a
+    process and a round depends only on its seed and actions, exactly
+    like a recording. Without a seed, ``reset`` draws the next one from
+    the stream started by the last seeded reset.
+    """
+
+    def __init__(self, width=1920, height=1080, hud_width=400, fps=60, round_time=30.0,
+                 frame_skip=1, crash_penalty=100):
+        self.width = width
+        self.height = height
+        self.hud_width = hud_width
+        self.fps = fps
+        self.round_time = round_time
+        self.frame_skip = frame_skip
+        self.crash_penalty = crash_penalty
+        self.world = None
+        self.seeder = None
+        self.rng_state = None
+        self.seed = None
+        self.steps = 0
+
+    @contextmanager
+    def simulation_rng(self, seed=None):
+        outer = random.getstate()
+        if seed is None:
+            random.setstate(self.rng_state)
+        else:
+            random.seed(seed)
+        try:
+            yield
+        finally:
+            self.rng_state = random.getstate()
+            random.setstate(outer)
+
+    def reset(self, seed=None, out=None):
+        if seed is not None or self.seeder is None:
+            self.seeder = random.Random(seed)
+        self.seed = self.seeder.getrandbits(63)
+        with self.simulation_rng(self.seed):
+            if self.world is None:
+                self.world = World(self.width, self.height, hud_width=self.hud_width,
+                                   fps=self.fps, round_time=self.round_time)
+            else:
+                self.world.reset()
+        self.world.particles.seed(self.seed)
+        self.steps = 0
+        return self.observe(out)
+
+    def step(self, action, out=None):
+        world = self.world
+        apply_input(world.player, action)
+        score, lives = world.score, world.lives
+        with self.simulation_rng():
+            for _ in range(self.frame_skip):
+                world.update()
+                if world.game_over:
+                    break
+        self.steps += 1
+        reward = world.score - score - self.crash_penalty * (lives - world.lives)
+        info = {"score": world.score, "lives": world.lives, "steps": self.steps, "seed": self.seed}
+        return self.observe(out), float(reward), world.game_over, info
+
+    def observe(self, out=None):
+        if out is None:
+            out = np.zeros(OBS_SIZE, dtype=np.float32)
+        world = self.world
+        player = world.player
+        w, h = world.bounds
+        rad = math.radians(player.angle)
+        out[:PLAYER_FEATURES] = (player.pos.x / w, player.pos.y / h,
+                                 player.speed.x / player.max_speed, player.speed.y / player.max_speed,
+                                 math.cos(rad), -math.sin(rad),
+                                 player.shoot_cooldown / player.shoot_cooldown_max,
+                                 world.lives / 3, world.time_left / world.round_time)
+
+        slots = out[PLAYER_FEATURES:].reshape(NEAREST_ASTEROIDS, ASTEROID_FEATURES)
+        slots[:] = 0
+        # A handful of asteroids: sorting tuples beats building arrays
+        px, py = player.pos
+        nearest = sorted(((a.pos.x - px, a.pos.y - py, a.speed.x, a.speed.y, a.radius)
+                          for a in world.asteroids.asteroids),
+                         key=lambda d: d[0] * d[0] + d[1] * d[1])[:NEAREST_ASTEROIDS]
+        if nearest:
+            rows = slots[:len(nearest)]
+            rows[:] = nearest
+            rows *= (1 / w, 1 / h, 1 / ASTEROID_MAX_SPEED, 1 / ASTEROID_MAX_SPEED, 1 / ASTEROID_MAX_RADIUS)
+        return out
+
+
+class _EnvBlock:
+    """Envs ``start:stop`` of a VectorEnv, stepped in place against the shared buffers"""
+
+    def __init__(self, start, stop, buffers, seed, env_kwargs):
+        obs, rewards, dones, actions = buffers
+        self.start = start
+        self.seed = seed
+        self.observations = np.frombuffer(obs, dtype=np.float32).reshape(-1, OBS_SIZE)
+        self.rewards = np.frombuffer(rewards, dtype=np.float32)
+        self.dones = np.frombuffer(dones, dtype=np.bool_)
+        self.actions = np.frombuffer(actions, dtype=np.uint8)
+        self.envs = [AsteroidEnv(**env_kwargs) for _ in range(start, stop)]
+
+    def reset(self):
+        for i, env in enumerate(self.envs, self.start):
+            env.reset(self.seed + i, out=self.observations[i])
+            self.rewards[i] = 0
+            self.dones[i] = False
+
+    def step(self):
+        """Step every env; returns ``(index, info)`` for the rounds that ended"""
+        finished = []
+        obs, actions = self.observations, self.actions
+        for i, env in enumerate(self.envs, self.start):
+            _, reward, done, info = env.step(int(actions[i]), out=obs[i])
+            self.rewards[i] = reward
+            self.dones[i] = done
+            if done:
+                finished.append((i, info))
+                env.reset(out=obs[i])
+        return finished
+
+
+def _worker(conn, start, stop, buffers, seed, env_kwargs):
+    # Nothing is drawn, so skip the cosmetic particles; levels never touch the simulation
+    quality.apply(len(LEVELS) - 1)
+    block = _EnvBlock(start, stop, buffers, seed, env_kwargs)
+    while True:
+        command = conn.recv()
+        if command == "step":
+            conn.send(block.step())
+        elif command == "reset":
+            block.reset()
+            conn.send(None)
+        elif command == "close":
+            break
+    conn.close()
+
+
+class VectorEnv:
+    """``num_envs`` AsteroidEnvs spread over a pool of worker processes.
+
+    Observations, rewards, done flags and actions live in shared memory
+    (``multiprocessing.RawArray``) and each worker steps its own
+    contiguous block of envs in place, so a step only sends one short
+    command down each worker's pipe. ``reset`` and ``step`` return views
+    of the shared buffers that are overwritten by the next call; copy
+    what you keep. A round that ends resets by itself: its row then
+    holds the new round's first observation and ``infos[i]`` the final
+    score. Env ``i`` is seeded from ``seed + i``, so results do not
+    depend on the worker count. ``workers=0`` steps every env in this
+    process.
+    """
+
+    def __init__(self, num_envs, workers=None, seed=0, context=None, **env_kwargs):
+        ctx = multiprocessing.get_context(context)
+        if workers is None:
+            workers = min(num_envs, os.cpu_count() or 1)
+        workers = min(workers, num_envs)
+        self.num_envs = num_envs
+        buffers = (ctx.RawArray(ctypes.c_float, num_envs * OBS_SIZE),
+                   ctx.RawArray(ctypes.c_float, num_envs),
+                   ctx.RawArray(ctypes.c_bool, num_envs),
+                   ctx.RawArray(ctypes.c_uint8, num_envs))
+        self.observations = np.frombuffer(buffers[0], dtype=np.float32).reshape(num_envs, OBS_SIZE)
+        self.rewards = np.frombuffer(buffers[1], dtype=np.float32)
+        self.dones = np.frombuffer(buffers[2], dtype=np.bool_)
+        self.actions = np.frombuffer(buffers[3], dtype=np.uint8)
+
+        self.local = None
+        self.pipes = []
+        self.processes = []
+        if workers == 0:
+            self.local = _EnvBlock(0, num_envs, buffers, seed, env_kwargs)
+        for k in range(workers):
+            start, stop = num_envs * k // workers, num_envs * (k + 1) // workers
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(child, start, stop, buffers, seed, env_kwargs),
+                                  name=f"env-worker-{k}", daemon=True)
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+        self.waiting = False
+
+    def reset(self):
+        if self.waiting:
+            # Collect the step in flight so its reply is not read as the reset's
+            self.step_wait()
+        if self.local is not None:
+            self.local.reset()
+        for conn in self.pipes:
+            conn.send("reset")
+        for conn in self.pipes:
+            conn.recv()
+        return self.observations
+
+    def step_async(self, actions):
+        """Start a step; the workers run while the caller does other work"""
+        self.actions[:] = actions
+        for conn in self.pipes:
+            conn.send("step")
+        self.waiting = True
+
+    def step_wait(self):
+        finished = self.local.step() if self.local is not None else []
+        for conn in self.pipes:
+            finished += conn.recv()
+        self.waiting = False
+        infos = [{} for _ in range(self.num_envs)]
+        for i, info in finished:
+            infos[i] = info
+        return self.observations, self.rewards, self.dones, infos
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self, timeout=5.0):
+        """Stop the workers; any still running after ``timeout`` seconds are terminated"""
+        if self.waiting:
+            try:
+                self.step_wait()
+            except (EOFError, OSError):
+                # A worker already died; shut down the rest anyway
+                self.waiting = False
+        for conn in self.pipes:
+            try:
+                conn.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.pipes = []
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def run_random(num_envs, workers, steps, seed=0, frame_skip=1):
+    """Step ``num_envs`` envs with random actions and return env-steps/sec"""
+    rng = np.random.default_rng(seed)
+    with VectorEnv(num_envs, workers, seed=seed, frame_skip=frame_skip) as envs:
+        envs.reset()
+        start = time.perf_counter()
+        for _ in range(steps):
+            envs.step(rng.integers(0, ACTION_COUNT, num_envs))
+        elapsed = time.perf_counter() - start
+    return num_envs * steps / elapsed if elapsed > 0 else float("inf")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure vectorized env throughput with a random policy")
+    parser.add_argument("--envs", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="worker process counts to compare (0 steps in this process)")
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--frame-skip", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in args.workers:
+        rate = run_random(args.envs, workers, args.steps, args.seed, args.frame_skip)
+        baseline = baseline or rate
+        print(f"{workers:>3} workers {rate:>10.0f} env-steps/sec  ({rate / baseline:.2f}x)")
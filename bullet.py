@@ -1,46 +1,61 @@
 import pygame
-import random
 import math
+from asset_registry import assets
+from particles import TRAIL
+from stamps import stamps
+from text_cache import text_cache
+from timestep import lerp_position
+from pool import Pool
+from quality import quality
 
 class Bullet:
-    def __init__(self, x, y, vx, vy, font=None, sound_manager=None):
-        self.pos = pygame.Vector2(x, y)
-        self.vel = pygame.Vector2(vx, vy)
+    __slots__ = ("pos", "prev_pos", "vel", "radius", "lifespan", "symbol", "rect",
+                 "sound_manager", "font", "glow_alpha", "glow_growing", "glow_pulse_speed",
+                 "particles")
+
+    def __init__(self, x, y, vx, vy, font=None, sound_manager=None, particles=None):
+        self.pos = pygame.Vector2()
+        self.prev_pos = pygame.Vector2()
+        self.vel = pygame.Vector2()
         self.radius = 6  # Much smaller
-        self.lifespan = 60
         self.symbol = "AIC"
         self.rect = pygame.Rect(0, 0, self.radius * 4, self.radius * 2)
+        self.glow_pulse_speed = 6
+        self.reset(x, y, vx, vy, font, sound_manager, particles)
+
+    def reset(self, x, y, vx, vy, font=None, sound_manager=None, particles=None):
+        """Re-initialise in place for reuse from ``bullet_pool``"""
+        self.pos.update(x, y)
+        self.prev_pos.update(x, y)
+        self.vel.update(vx, vy)
+        self.lifespan = 60
         self.update_rect()
         self.sound_manager = sound_manager
-        self.font = font if font else pygame.font.SysFont("Arial Black", 12, bold=True)  # Smaller font
+        self.font = font  # Resolved lazily in draw() so headless bullets never touch pygame.font
 
         # Laser effect parameters
         self.glow_alpha = 150
         self.glow_growing = True
-        self.glow_pulse_speed = 6
-        self.trail_particles = []
+        self.particles = particles
+
+    def __setstate__(self, state):
+        # Unpickled (restored from a snapshot) bullets count as live in the pool
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        bullet_pool.adopt()
 
     def update_rect(self):
         self.rect.center = (int(self.pos.x), int(self.pos.y))
 
     def update(self):
+        self.prev_pos.update(self.pos)
         self.pos += self.vel
         self.lifespan -= 1
         self.animate_glow()
         
         # Create small trail effect
-        if random.random() < 0.3:
-            self.trail_particles.append({
-                'pos': self.pos.copy(),
-                'age': 0,
-                'max_age': 12
-            })
-        
-        # Update trail particles
-        for particle in self.trail_particles[:]:
-            particle['age'] += 1
-            if particle['age'] >= particle['max_age']:
-                self.trail_particles.remove(particle)
+        if self.particles is not None and quality.bullet_trails and self.particles.rng.random() < 0.3:
+            self.particles.emit(1, self.pos.x, self.pos.y, 0, 0, 12, 3, (255, 255, 0), TRAIL, alpha=180)
         
         self.update_rect()
 
@@ -56,33 +71,28 @@ class Bullet:
                 self.glow_alpha = 100
                 self.glow_growing = True
 
-    def draw(self, screen):
-        # Draw small trail particles
-        for particle in self.trail_particles:
-            alpha = int(180 * (1 - particle['age'] / particle['max_age']))
-            color = (255, 255, 0, alpha)
-            trail_size = 3
-            trail_surf = pygame.Surface((trail_size * 2, trail_size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(trail_surf, color, (trail_size, trail_size), trail_size)
-            screen.blit(trail_surf, (particle['pos'].x - trail_size, particle['pos'].y - trail_size), 
-                       special_flags=pygame.BLEND_ADD)
-
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        pos = lerp_position(self.prev_pos, self.pos, alpha) * scale
+        
         # Draw compact glow
-        glow_radius = self.radius * 2.5
-        glow_alpha = int(self.glow_alpha)
-        glow_color = (255,0, 0, glow_alpha)
-        glow_size = int(glow_radius)
-        glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, glow_color, (glow_size, glow_size), glow_size)
-        screen.blit(glow_surface,
-                   (self.pos.x - glow_size, self.pos.y - glow_size),
-                   special_flags=pygame.BLEND_ADD)
+        glow_rect = None
+        if quality.bullet_glow:
+            glow_size = int(self.radius * 2.5 * scale)
+            glow_surface = stamps.get(glow_size, (255, 0, 0), int(self.glow_alpha))
+            glow_rect = screen.blit(glow_surface,
+                       (pos.x - glow_size, pos.y - glow_size),
+                       special_flags=pygame.BLEND_ADD)
 
-        # Draw tiny 'AIC' text
-        letter_surface = self.font.render(self.symbol, True, (200, 255, 255))
-        rect = letter_surface.get_rect(center=(int(self.pos.x), int(self.pos.y)))
-        screen.blit(letter_surface, rect)
+        # Draw tiny 'AIC' text (the manager hands out a font sized for the render scale)
+        if self.font is None:
+            self.font = assets.font("Arial Black", max(1, round(12 * scale)), bold=True)  # Smaller font
+        letter_surface = text_cache.render(self.font, self.symbol, (200, 255, 255))
+        rect = letter_surface.get_rect(center=(int(pos.x), int(pos.y)))
+        text_rect = screen.blit(letter_surface, rect)
         
         # Core bright dot
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.pos.x), int(self.pos.y)), 2)
-        pygame.draw.circle(screen, (0, 255, 255), (int(self.pos.x), int(self.pos.y)), 4, 1)
+        pygame.draw.circle(screen, (255, 255, 255), (int(pos.x), int(pos.y)), max(1, round(2 * scale)))
+        pygame.draw.circle(screen, (0, 255, 255), (int(pos.x), int(pos.y)), max(1, round(4 * scale)), 1)
+        return glow_rect.union(text_rect) if glow_rect else text_rect
+
+bullet_pool = Pool(Bullet, "bullets")
@@ -1,26 +1,37 @@
-import pygame
-from bullet import Bullet
+from bullet import bullet_pool
 
 class BulletManager:
-    def __init__(self, font, sound_manager=None):
+    def __init__(self, font, sound_manager=None, particles=None):
         self.bullets = []
         self.bullet_font = font
         self.sound_manager = sound_manager
+        self.particles = particles
 
     def add(self, bullet):
         bullet.font = self.bullet_font
         bullet.sound_manager = self.sound_manager
+        bullet.particles = self.particles
         self.bullets.append(bullet)
-        if self.sound_manager:
-            self.sound_manager('shoot')
 
-    def update(self):
-        for bullet in self.bullets[:]:
+    def update(self, bounds):
+        w, h = bounds
+        alive = []
+        for bullet in self.bullets:
             bullet.update()
-            w, h = pygame.display.get_surface().get_size()
             if bullet.lifespan <= 0 or not (0 <= bullet.pos.x <= w and 0 <= bullet.pos.y <= h):
-                self.bullets.remove(bullet)
+                bullet_pool.release(bullet)
+            else:
+                alive.append(bullet)
+        self.bullets[:] = alive
 
-    def draw(self, screen):
-        for bullet in self.bullets:
-            bullet.draw(screen)
+    def remove(self, spent):
+        """Drop a set of bullets (e.g. ones that hit) and return them to the pool"""
+        self.bullets[:] = [b for b in self.bullets if b not in spent]
+        bullet_pool.release_all(spent)
+
+    def clear(self):
+        bullet_pool.release_all(self.bullets)
+        self.bullets.clear()
+
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        return [bullet.draw(screen, alpha, scale) for bullet in self.bullets]
@@ -0,0 +1,72 @@
+import pygame
+
+
+def bounding_rect(points, pad=0):
+    """Smallest integer rect covering the points, grown by ``pad`` on every side"""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    left = int(min(xs)) - pad
+    top = int(min(ys)) - pad
+    return pygame.Rect(left, top, int(max(xs)) + 1 + pad - left, int(max(ys)) + 1 + pad - top)
+
+
+class ScratchLayer:
+    """Reusable SRCALPHA buffer for compositing small effects onto the screen.
+
+    ``begin`` takes the screen-space rect about to be drawn and returns a
+    cleared region of a buffer that only grows when a larger region is
+    needed, so effects like engine flames cost a blend over their own
+    bounding box instead of a full-screen surface per frame.
+    """
+
+    def __init__(self):
+        self.buffer = None
+        self.surface = None
+        self.rect = None
+
+    def begin(self, rect):
+        self.rect = pygame.Rect(rect)
+        w, h = max(1, self.rect.width), max(1, self.rect.height)
+        if self.buffer is None or self.buffer.get_width() < w or self.buffer.get_height() < h:
+            bw = max(w, self.buffer.get_width() if self.buffer else 0)
+            bh = max(h, self.buffer.get_height() if self.buffer else 0)
+            self.buffer = pygame.Surface((bw, bh), pygame.SRCALPHA)
+        self.surface = self.buffer.subsurface((0, 0, w, h))
+        self.surface.fill((0, 0, 0, 0))
+        return self.surface
+
+    def local(self, points):
+        """Translate screen-space points into the layer's coordinates"""
+        x, y = self.rect.topleft
+        return [(px - x, py - y) for px, py in points]
+
+    def polygon(self, color, points, width=0):
+        return pygame.draw.polygon(self.surface, color, self.local(points), width)
+
+    def composite(self, screen, special_flags=0):
+        return screen.blit(self.surface, self.rect.topleft, special_flags=special_flags)
+
+
+class TintLayer:
+    """Translucent solid-color fills without per-frame surface allocation.
+
+    Uses an opaque buffer with surface-level alpha, which blends faster
+    than a per-pixel SRCALPHA surface and is only reallocated when a
+    larger area is requested.
+    """
+
+    def __init__(self):
+        self.buffer = None
+
+    def draw(self, screen, rect, color, alpha):
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0 or alpha <= 0:
+            return rect
+        if self.buffer is None or self.buffer.get_width() < rect.width or self.buffer.get_height() < rect.height:
+            bw = max(rect.width, self.buffer.get_width() if self.buffer else 0)
+            bh = max(rect.height, self.buffer.get_height() if self.buffer else 0)
+            self.buffer = pygame.Surface((bw, bh))
+        region = self.buffer.subsurface((0, 0, rect.width, rect.height))
+        region.fill(color[:3])
+        region.set_alpha(alpha)
+        return screen.blit(region, rect.topleft)
@@ -1,59 +1,602 @@
+import atexit
+import bisect
+import contextlib
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class ScoreJournal:
+    """Leaderboard storage as a compacted snapshot plus an append-only journal"""
+
+    def __init__(self, path, compact_every=256, shared=False):
+        # ``path`` holds the snapshot {"seq": n, "scores": [...]}; each new
+        # score is appended to the journal as one JSON line with its seq
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.old_journal_path = self.journal_path + ".old"
+        self.compact_every = compact_every
+        self.seq = 0
+        self.journal_records = 0
+        self.lock = threading.RLock()
+        self.compactor = None
+        self.file = None
+        # Exactly what is stored, so a snapshot never holds an unjournaled score
+        self.entries = []
+        # Several processes (kiosks) on the same files: every append and
+        # compaction holds the file lock and catches up on the others first
+        self.shared = shared
+        self.file_lock = FileLock(path + ".lock") if shared else contextlib.nullcontext()
+        self.reader = None
+        self.reader_ino = None
+        self.offset = 0
+        self.partial = b""
+        # Records other processes journaled, and whether missing some forced a reload
+        self.incoming = []
+        self.reloaded = False
+
+    def load(self):
+        """All stored entries: the snapshot plus any journal records past it"""
+        self.wait()
+        with self.lock, self.file_lock:
+            self.close_reader()
+            entries, snapshot_seq = self.read_snapshot()
+            self.seq = snapshot_seq
+            self.journal_records = 0
+            records = list(self.read_journal(self.old_journal_path))
+            if self.shared:
+                records += self.read_new()
+            else:
+                records += self.read_journal(self.journal_path)
+            for record in records:
+                seq = record.pop("seq")
+                if seq > snapshot_seq and not record.get("compacted"):
+                    entries.append(record)
+                    self.seq = max(self.seq, seq)
+                    self.journal_records += 1
+            self.entries = entries
+            self.incoming = []
+            return list(entries)
+
+    def reload(self):
+        self.load()
+        self.reloaded = True
+
+    def read_snapshot(self):
+        if not os.path.exists(self.path):
+            return [], 0
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            # Keep the evidence instead of silently starting from nothing
+            aside = f"{self.path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+            os.replace(self.path, aside)
+            print(f"Leaderboard snapshot unreadable ({e}); moved to {aside}")
+            return [], 0
+        if isinstance(data, list):
+            # Plain list from before the journal existed
+            return data, 0
+        return data["scores"], data["seq"]
+
+    def read_journal(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append
+                    continue
+
+    def read_new(self):
+        """Shared mode: journal records appended since the last read"""
+        # Tails the journal from the last offset: a stat, and a read only when it grew
+        try:
+            st = os.stat(self.journal_path)
+        except FileNotFoundError:
+            st = None
+        records = []
+        if self.reader_ino is not None and (st is None or st.st_ino != self.reader_ino):
+            # Compacted. The rest of the old journal is only reachable through an
+            # open handle; without one, the new journal's marker shows what we missed
+            if self.reader is not None:
+                records = self.read_reader()
+            self.close_reader()
+            self.journal_records = 0
+        if st is None:
+            return records
+        if self.reader_ino is None:
+            try:
+                self.reader = open(self.journal_path, "rb")
+            except FileNotFoundError:
+                return records  # Rotated between the stat and the open
+            self.reader_ino = os.fstat(self.reader.fileno()).st_ino
+        elif st.st_size == self.offset:
+            return records
+        records += self.read_reader()
+        self.release_reader()
+        return records
+
+    def read_reader(self):
+        if self.reader is None:
+            self.reader = open(self.journal_path, "rb")
+            self.reader.seek(self.offset)
+        data = self.reader.read()
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        # An incomplete last line is still being written (or was torn by a crash)
+        self.partial = lines.pop()
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def release_reader(self):
+        if os.name == "nt" and self.reader is not None:
+            # Windows can't rename a file another process holds open; reopen at the offset next time
+            self.reader.close()
+            self.reader = None
+
+    def close_reader(self):
+        if self.reader is not None:
+            self.reader.close()
+        self.reader = None
+        self.reader_ino = None
+        self.offset = 0
+        self.partial = b""
+
+    def catch_up(self):
+        """Shared mode: take in records other processes journaled (call with ``lock`` held)"""
+        for record in self.read_new():
+            seq = record.pop("seq")
+            if record.get("compacted") and seq == self.seq:
+                continue
+            if seq <= self.seq:
+                continue
+            if seq != self.seq + 1 or record.get("compacted"):
+                # Missed records (compacted before we read them): start over from disk
+                self.reload()
+                return
+            self.seq = seq
+            self.entries.append(record)
+            self.incoming.append(record)
+            self.journal_records += 1
+
+    def append(self, entries):
+        """Durably journal new entries: one write and one fsync per call"""
+        if not entries:
+            return
+        with self.lock, self.file_lock:
+            if self.shared:
+                self.catch_up()
+            if self.file is None:
+                self.file = open(self.journal_path, "a", encoding="utf-8")
+            lines = []
+            if self.shared and self.partial:
+                # Start clear of a line torn by a process that crashed mid-append
+                lines.append("\n")
+            for entry in entries:
+                self.seq += 1
+                lines.append(json.dumps({"seq": self.seq, **entry}) + "\n")
+            self.file.write("".join(lines))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.journal_records += len(entries)
+            self.entries.extend(entries)
+            if self.shared:
+                self.skip_written()
+
+    def skip_written(self):
+        # Move the tail past our own records; another process may rotate the
+        # journal once we unlock, so don't keep appending through this handle
+        size = os.fstat(self.file.fileno()).st_size
+        self.file.close()
+        self.file = None
+        if self.reader_ino is None:
+            self.reader = open(self.journal_path, "rb")
+            self.reader_ino = os.fstat(self.reader.fileno()).st_ino
+        if self.reader is not None:
+            self.reader.seek(size)
+        self.offset = size
+        self.partial = b""
+        self.release_reader()
+
+    def needs_compaction(self):
+        return self.journal_records >= self.compact_every and not self.compacting()
+
+    def compacting(self):
+        return self.compactor is not None and self.compactor.is_alive()
+
+    def compact(self, background=True, force=False):
+        """Fold the journal into a new snapshot of every stored entry"""
+        # Rotates the journal aside and writes the snapshot (on a thread by default)
+        self.wait()
+        with self.lock, self.file_lock:
+            if self.shared:
+                self.catch_up()
+                if not force and self.journal_records < self.compact_every:
+                    return  # Another process just compacted
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            if os.path.exists(self.old_journal_path) and os.path.exists(self.journal_path):
+                # A previous compaction failed; its journal still holds unsnapshotted scores
+                with open(self.journal_path, "rb") as src, open(self.old_journal_path, "ab") as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_path)
+            elif os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.old_journal_path)
+            seq = self.seq
+            entries = list(self.entries)
+            self.journal_records = 0
+            if self.shared:
+                # Other processes append as soon as we unlock; finish while holding it.
+                # The marker opening the next journal shows a process that missed
+                # records folded into the snapshot a jump in seq, so it reloads
+                self.write_snapshot(entries, seq)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"seq": seq, "compacted": True}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                return
+        if background:
+            self.compactor = threading.Thread(target=self.write_snapshot, args=(entries, seq),
+                                              name="leaderboard-compactor", daemon=True)
+            self.compactor.start()
+        else:
+            self.write_snapshot(entries, seq)
+
+    def write_snapshot(self, entries, seq):
+        # Temp file plus rename: a crash leaves either the old or the new snapshot,
+        # and the rotated journal is only deleted once the new one is in place
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"seq": seq, "scores": entries}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        sync_directory(self.path)
+        if os.path.exists(self.old_journal_path):
+            os.remove(self.old_journal_path)
+
+    def clear(self):
+        """Drop every stored entry and write the empty snapshot now"""
+        self.wait()
+        with self.lock, self.file_lock:
+            if self.shared:
+                self.catch_up()
+                # Skip a sequence number so other processes see a gap and reload
+                self.seq += 1
+            self.entries = []
+            self.compact(background=False, force=True)
+
+    def wait(self):
+        """Block until a running compaction finishes"""
+        if self.compactor is not None:
+            self.compactor.join()
+            self.compactor = None
+
+    def close(self):
+        self.wait()
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            self.close_reader()
+            if self.shared:
+                self.file_lock.close()
+
+
+class FileLock:
+    """Advisory lock shared between processes, held on its own lock file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        # flock on POSIX, a one-byte msvcrt lock on Windows. Re-entrant within a
+        # process; callers serialise threads (ScoreJournal.lock is taken first)
+        self.depth = 0
+
+    def __enter__(self):
+        if self.depth == 0:
+            if self.file is None:
+                self.file = open(self.path, "a+b")
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            else:
+                self.file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK gives up after ten seconds; keep waiting
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class BackgroundWriter:
+    """Runs a leaderboard's storage writes on a daemon thread"""
+
+    STOP = object()
+
+    def __init__(self, write, finish=None, max_queued=64, coalesce_delay=0.05):
+        self.write = write
+        # Runs on the thread after the last write
+        self.finish = finish
+        self.queue = queue.Queue(max_queued)
+        self.coalesce_delay = coalesce_delay
+        self.submitted = 0
+        self.writes = 0
+        self.thread = threading.Thread(target=self.run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def submit(self, work):
+        """Queue ``work`` without blocking; False when full, so the caller offers it again next save"""
+        try:
+            self.queue.put_nowait(work)
+        except queue.Full:
+            return False
+        self.submitted += 1
+        return True
+
+    def run(self):
+        running = True
+        while running:
+            # Scores saved close together: wait a moment, then write them in one call
+            batch = [self.queue.get()]
+            if batch[0] is not self.STOP:
+                time.sleep(self.coalesce_delay)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            work = [item for item in batch if item is not self.STOP]
+            running = len(work) == len(batch)
+            try:
+                if work:
+                    self.write(work)
+                    self.writes += 1
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+        if self.finish:
+            self.finish()
+
+    def flush(self):
+        """Block until everything submitted so far has been written"""
+        self.queue.join()
+
+    def close(self):
+        """Flush the queue and stop the thread (also run at exit)"""
+        if self.thread.is_alive():
+            self.queue.put(self.STOP)
+            self.thread.join()
+        atexit.unregister(self.close)
+
+
+def sync_directory(path):
+    """fsync the directory holding ``path`` so a rename survives power loss"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows: no directory handles; the rename itself is atomic
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class Leaderboard:
-    def __init__(self, filename):
+    """Scores kept sorted best-first, with bisect indexes over them"""
+
+    def __init__(self, filename, compact_every=256, background=False, shared=False,
+                 poll_interval=0.5):
         self.filename = filename
+        # save appends only the scores added since the last save
+        self.journal = ScoreJournal(filename, compact_every, shared)
         self.scores = []
+        self.pending = []
+        self.in_flight = []
+        # Negated scores in ``scores`` order, so insert position and rank are
+        # binary searches; equal scores keep insertion order
+        self._keys = []
+        # Each player's sorted scores
+        self._players = {}
+        # Shared: read methods merge other processes' scores at most this often
+        self.poll_interval = poll_interval
+        self.last_poll = time.monotonic()
         self.load()
+        # Background: the journal append (and any compaction) runs on the writer
+        # thread and save only hands the new scores over
+        self.writer = BackgroundWriter(self.write) if background else None
 
     def load(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, "r") as f:
-                    self.scores = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self.scores = []
-        else:
+        try:
+            self.scores = self.journal.load()
+        except (IOError, KeyError, TypeError) as e:
+            print(f"Error loading leaderboard: {e}")
             self.scores = []
+        self.pending = []
+        self.reindex()
+
+    def reindex(self):
+        """Re-sort ``scores`` and rebuild the indexes after replacing it wholesale"""
+        self.scores.sort(key=lambda s: s["score"], reverse=True)
+        self._keys = [-entry["score"] for entry in self.scores]
+        self._players = {}
+        for entry in reversed(self.scores):
+            self._players.setdefault(entry["name"], []).append(entry["score"])
+
+    def refresh(self):
+        """Merge scores other processes saved to a shared journal"""
+        journal = self.journal
+        if not journal.shared:
+            return
+        now = time.monotonic()
+        if now - self.last_poll < self.poll_interval:
+            return
+        # The writer thread holds the lock while it writes, and catches up itself
+        if not journal.lock.acquire(blocking=False):
+            return
+        self.last_poll = now
+        try:
+            journal.catch_up()
+            if journal.reloaded:
+                # Everything from disk, plus ours that haven't been written yet
+                self.scores = list(journal.entries)
+                for batch in self.in_flight:
+                    self.scores.extend(batch)
+                self.scores.extend(self.pending)
+                self.reindex()
+            else:
+                for entry in journal.incoming:
+                    self.insert(entry)
+            journal.incoming = []
+            journal.reloaded = False
+        except IOError as e:
+            print(f"Error reading leaderboard: {e}")
+        finally:
+            journal.lock.release()
 
     def save(self):
+        if not self.pending:
+            return
+        if self.writer is None:
+            self.write([self.pending])
+        else:
+            # Listed before the writer can see it, so it is never unlisted twice
+            self.in_flight.append(self.pending)
+            if not self.writer.submit(self.pending):
+                self.in_flight.pop()
+                return  # Writer backed up: keep them for the next save
+        self.pending = []
+
+    def write(self, batches):
+        """Journal each batch of new entries in one append"""
         try:
-            with open(self.filename, "w") as f:
-                json.dump(self.scores, f, indent=4)
+            with self.journal.lock:
+                self.journal.append([entry for batch in batches for entry in batch])
+                for batch in batches:
+                    if batch in self.in_flight:
+                        self.in_flight.remove(batch)
+            if self.journal.needs_compaction():
+                # Already off the game thread when there is a writer
+                self.journal.compact(background=self.writer is None)
         except IOError as e:
             print(f"Error saving leaderboard: {e}")
 
     def add_score(self, name, score):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.scores.append({
+        entry = {
             "name": name,
             "score": score,
             "timestamp": timestamp
-        })
-        self.scores.sort(key=lambda s: s["score"], reverse=True)
+        }
+        self.insert(entry)
+        self.pending.append(entry)
 
-    def get_top_scores(self, count=None):
+    def insert(self, entry):
+        index = bisect.bisect_right(self._keys, -entry["score"])
+        self._keys.insert(index, -entry["score"])
+        self.scores.insert(index, entry)
+        bisect.insort(self._players.setdefault(entry["name"], []), entry["score"])
+
+    def get_top_scores(self, count=None, offset=0):
+        self.refresh()
         if count is None:
-            return self.scores
-        return self.scores[:count]
+            return self.scores[offset:] if offset else self.scores
+        return self.scores[offset:offset + count]
 
     def get_player_rank(self, name, score):
-        temp_scores = self.scores.copy()
-        temp_scores.append({"name": name, "score": score})
-        temp_scores.sort(key=lambda s: s["score"], reverse=True)
-        
-        for i, entry in enumerate(temp_scores):
-            if entry["name"] == name and entry["score"] == score:
-                return i + 1
-        return len(temp_scores)
+        """1-based rank ``score`` would take, or the rank of ``name``'s entry with it"""
+        self.refresh()
+        first = bisect.bisect_left(self._keys, -score)
+        last = bisect.bisect_right(self._keys, -score)
+        if self.has_score(name, score):
+            # An existing tied entry of theirs sits ahead of the new one
+            for i in range(first, last):
+                if self.scores[i]["name"] == name:
+                    return i + 1
+        return last + 1
+
+    def has_score(self, name, score):
+        player = self._players.get(name, ())
+        i = bisect.bisect_left(player, score)
+        return i < len(player) and player[i] == score
+
+    def get_player_best(self, name):
+        player = self._players.get(name)
+        return player[-1] if player else None
 
     def get_high_score(self):
+        self.refresh()
         if self.scores:
             return self.scores[0]["score"]
         return 0
 
+    def count(self):
+        return len(self.scores)
+
     def clear_leaderboard(self):
         self.scores = []
-        self.save()
+        self.pending = []
+        self.reindex()
+        if self.writer is not None:
+            self.writer.flush()
+        try:
+            self.journal.clear()
+        except IOError as e:
+            print(f"Error saving leaderboard: {e}")
+
+    def close(self):
+        """Write out unsaved scores, finish any compaction and close the journal"""
+        if self.writer is not None:
+            self.save()
+            self.writer.close()
+            if self.pending:
+                self.write([self.pending])
+                self.pending = []
+        self.journal.close()
+
+
+def open_leaderboard(backend="json", filename=None, json_filename="leaderboard.json",
+                     background=False, shared=False):
+    """Open the leaderboard with the chosen storage engine ("json" or "sqlite")"""
+    if backend == "sqlite":
+        # Imports json_filename the first time; SQLite's own locking covers shared use
+        from sqlite_leaderboard import SQLiteLeaderboard
+        return SQLiteLeaderboard(filename or "leaderboard.db", migrate_from=json_filename,
+                                 background=background)
+    return Leaderboard(filename or json_filename, background=background, shared=shared)
@@ -1,23 +1,74 @@
 import pygame
+import os
 import sys
 import math
 import random
-from player import Player
-from bullet import Bullet
-from asteroid import AsteroidManager
-from bullet_manager import BulletManager
-from explosion import ExplosionManager
-from leaderboard import Leaderboard
+import time
+from asset_registry import assets, init_pygame, trace
+from world import World
+from particles import ParticleEngine, FLOAT
+from compositor import TintLayer
+from widgets import WidgetCache
+from text_cache import text_cache
+from renderer import DirtyRectRenderer
+from starfield import Starfield
+from timestep import FixedTimestep
+from profiler import FrameProfiler
+from leaderboard import open_leaderboard
+from replay import Recorder, prune_recordings
+from pool import pools
+from quality import QualityGovernor, quality
+from asteroid import sprites
 from sounds import SoundManager
 
-pygame.mixer.pre_init(44100, -16, 2, 512)
-pygame.init()
-
-infoObject = pygame.display.Info()
-SCREEN_WIDTH, SCREEN_HEIGHT = infoObject.current_w, infoObject.current_h
+# Taken from the display when the first Game starts; set beforehand to force a size
+SCREEN_WIDTH, SCREEN_HEIGHT = None, None
 
+# Simulation ticks per second; gameplay speed is tied to this, not to the render rate
 FPS = 60
 
+# Render frame cap (e.g. 120/144 for high-refresh displays, 30 under load)
+RENDER_FPS = 60
+
+# Most simulation ticks run in one rendered frame before time is dropped
+MAX_TICKS_PER_FRAME = 5
+
+# Frame profiler hotkeys: toggle the per-phase overlay, dump timings to CSV/JSON
+PROFILER_OVERLAY_KEY = pygame.K_F3
+PROFILER_EXPORT_KEY = pygame.K_F4
+
+# Leaderboard storage: "json" (in-memory, journaled) or "sqlite" (indexed
+# queries, nothing loaded up front; imports leaderboard.json on first run)
+LEADERBOARD_BACKEND = "json"
+# Save scores on a writer thread; quitting flushes it
+LEADERBOARD_BACKGROUND_WRITES = True
+# Several kiosks on one machine or shared drive using the same leaderboard
+# files: lock around writes and merge each other's scores as they land
+LEADERBOARD_SHARED = False
+
+# Step effect quality down (and back up) to hold the render frame budget;
+# off by default so a round always looks the same
+ADAPTIVE_QUALITY = False
+STAR_COUNT = 200
+
+# Record every round's seed and inputs for replay (python replay.py <file>);
+# only the newest MAX_RECORDINGS files are kept
+RECORD_SESSIONS = False
+RECORDINGS_DIR = "recordings"
+MAX_RECORDINGS = 200
+
+# Present only changed screen regions (static starfield) instead of full flips
+DIRTY_RECT_RENDERING = False
+
+# Internal render resolution as a fraction of the display (e.g. 0.5, 0.66):
+# gameplay and HUD draw offscreen at that size and are upscaled in one pass.
+# The simulation and layout stay in display pixels either way
+RENDER_SCALE = 1.0
+# Bilinear instead of nearest-neighbour upscaling (several times slower on the CPU)
+SMOOTH_UPSCALE = False
+# Below 1.0, draw text at display resolution on top of the upscaled frame
+NATIVE_HUD_TEXT = True
+
 # Professional Color Palette
 COLOR_BG_DARK = (10, 12, 20)
 COLOR_BG_MEDIUM = (20, 25, 35)
@@ -34,386 +85,453 @@ COLOR_TEXT_SECONDARY = (150, 160, 180)
 COLOR_PANEL_BG = (25, 30, 45, 220)
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("AIC Asteroid Shooter")
+    def __init__(self, dirty_rects=DIRTY_RECT_RENDERING, fullscreen=True, adaptive_quality=ADAPTIVE_QUALITY,
+                 render_scale=RENDER_SCALE, native_hud_text=NATIVE_HUD_TEXT):
+        global SCREEN_WIDTH, SCREEN_HEIGHT
+        init_pygame()
+        with trace.phase("display"):
+            if SCREEN_WIDTH is None:
+                info = pygame.display.Info()
+                SCREEN_WIDTH, SCREEN_HEIGHT = info.current_w, info.current_h
+            flags = pygame.FULLSCREEN if fullscreen else 0
+            self.display = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+            # Fullscreen may snap to another mode; layout follows what we got
+            SCREEN_WIDTH, SCREEN_HEIGHT = self.display.get_size()
+            pygame.display.set_caption("AIC Asteroid Shooter")
+            # Everything draws into self.screen: the display itself, or a
+            # smaller offscreen target that the renderer upscales
+            self.render_scale = min(render_scale, 1.0)
+            if self.render_scale < 1.0:
+                size = (round(SCREEN_WIDTH * self.render_scale), round(SCREEN_HEIGHT * self.render_scale))
+                self.screen = pygame.Surface(size).convert()
+            else:
+                self.screen = self.display
+            self.native_text = native_hud_text and self.screen is not self.display
         self.clock = pygame.time.Clock()
-        
-        # Professional Font Setup
-        self.font_xs = pygame.font.SysFont("Segoe UI", 16, bold=False)
-        self.font_sm = pygame.font.SysFont("Segoe UI", 20, bold=True)
-        self.font_md = pygame.font.SysFont("Segoe UI", 28, bold=True)
-        self.font_lg = pygame.font.SysFont("Segoe UI", 40, bold=True)
-        self.font_xl = pygame.font.SysFont("Segoe UI", 56, bold=True)
-        self.font_xxl = pygame.font.SysFont("Segoe UI", 80, bold=True)
-        self.font_title = pygame.font.SysFont("Segoe UI", 120, bold=True)
-        self.bullet_font = pygame.font.SysFont("Arial", 32, bold=True)
-        
-        self.leaderboard = Leaderboard("leaderboard.json")
-        self.sound_manager = SoundManager()
+        self.timestep = FixedTimestep(FPS, MAX_TICKS_PER_FRAME)
+        
+        # Frame-time instrumentation; only records while the overlay is shown
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        
+        # Professional Font Setup (paths cached in font_cache.json between runs)
+        self.fitted = {}
+        with trace.phase("fonts"):
+            self.font_xs = self.load_font("Segoe UI", 16, bold=False)
+            self.font_sm = self.load_font("Segoe UI", 20, bold=True)
+            self.font_md = self.load_font("Segoe UI", 28, bold=True)
+            self.font_lg = self.load_font("Segoe UI", 40, bold=True)
+            self.font_xl = self.load_font("Segoe UI", 56, bold=True)
+            self.font_xxl = self.load_font("Segoe UI", 80, bold=True)
+            self.font_title = self.load_font("Segoe UI", 120, bold=True)
+            self.bullet_font = self.load_font("Arial", 32, bold=True)
+            self.font_mono = self.load_font("Consolas", 18)
+        
+        with trace.phase("leaderboard"):
+            self.leaderboard = open_leaderboard(LEADERBOARD_BACKEND,
+                                                background=LEADERBOARD_BACKGROUND_WRITES,
+                                                shared=LEADERBOARD_SHARED)
+        with trace.phase("mixer"):
+            self.sound_manager = SoundManager()
 
         self.player_name = ""
         self.players_queue = []
         self.current_player = None
         self.cursor_blink = 0
         self.animation_timer = 0
-        self.particle_effects = []
+        self.particles = ParticleEngine()
+        self.tint = TintLayer()
+        self.widgets = WidgetCache()
+        self.widgets.set_resolution(self.screen.get_size(), self.render_scale)
 
         self.state = "START_SCREEN"
-        self.asteroids = None
-        self.bullets = None
-        self.explosions = None
-        self.player = None
-        self.score = 0
-        self.lives = 3
-        self.time_left = 30.0
+        self.world = None
+        self.recorder = None
         
         # Background effects
-        self.stars = self.generate_stars(200)
-
-    def generate_stars(self, count):
-        """Generate parallax star field"""
-        stars = []
-        for _ in range(count):
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT)
-            size = random.randint(1, 2)
-            speed = random.uniform(0.05, 0.3)
-            brightness = random.randint(120, 255)
-            stars.append({
-                'x': x, 'y': y, 'size': size, 
-                'speed': speed, 'brightness': brightness
-            })
-        return stars
+        with trace.phase("starfield"):
+            self.starfield = Starfield(*self.screen.get_size(), int(STAR_COUNT * quality.star_density),
+                                       bg_color=COLOR_BG_DARK)
+        
+        # Presentation: full flips, or dirty rectangles over a static backdrop
+        self.renderer = DirtyRectRenderer(self.screen, enabled=dirty_rects, display=self.display,
+                                          smooth=SMOOTH_UPSCALE)
+        if dirty_rects:
+            with trace.phase("static background"):
+                self.renderer.set_background(self.render_static_background())
+        
+        # Watches gameplay frame times and trades effects for frame rate
+        self.governor = None
+        self.quality_rebuild = None
+        if adaptive_quality:
+            self.governor = QualityGovernor(quality, 1000.0 / RENDER_FPS, on_change=self.apply_quality)
+
+    def load_font(self, name, size, bold=False):
+        """Font at layout size, remembering its twin sized for the render target"""
+        font = assets.font(name, size, bold=bold)
+        self.fitted[font] = assets.font(name, max(1, round(size * self.render_scale)), bold=bold)
+        return font
+
+    def fit(self, font):
+        return self.fitted.get(font, font)
+
+    def px(self, value):
+        """Layout pixels (display resolution) to render-target pixels"""
+        return round(value * self.render_scale)
+
+    def layout_rect(self, x, y, width, height):
+        left, top = self.px(x), self.px(y)
+        return pygame.Rect(left, top, self.px(x + width) - left, self.px(y + height) - top)
 
     def draw_starfield(self):
-        """Draw animated starfield background - FIXED"""
-        self.screen.fill(COLOR_BG_DARK)
+        """Draw animated parallax starfield background"""
+        if self.renderer.enabled:
+            # Dirty-rect mode keeps a static backdrop and restores only what changed
+            self.renderer.begin_frame()
+            return
         
-        for star in self.stars:
-            star['x'] = (star['x'] - star['speed']) % SCREEN_WIDTH
-            alpha = star['brightness'] + int(30 * math.sin(self.animation_timer * 0.03 + star['x']))
-            alpha = max(80, min(255, alpha))
-            color = (alpha, alpha, alpha)  # Fixed: simple RGB tuple
-            pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), star['size'])
+        self.starfield.update()
+        self.starfield.draw(self.screen, self.animation_timer)
+
+    def render_static_background(self):
+        """Starfield snapshot used as the dirty-rect backdrop"""
+        background = pygame.Surface(self.screen.get_size()).convert()
+        self.starfield.draw(background, self.animation_timer, twinkle=False)
+        return background
+
+    def apply_quality(self, settings):
+        """Schedule the rebuild a quality switch calls for"""
+        sprites.set_detail(settings.asteroid_detail)  # Frames re-render lazily as they are drawn
+        self.quality_rebuild = self.rebuild_for_quality(settings)
+
+    def rebuild_for_quality(self, settings):
+        """Regenerate the starfield one layer per frame, then the backdrop"""
+        yield from self.starfield.build(int(STAR_COUNT * settings.star_density))
+        if self.renderer.enabled:
+            yield
+            self.renderer.set_background(self.render_static_background())
+        else:
+            self.renderer.invalidate()
 
     def draw_glass_panel(self, x, y, width, height, alpha=220):
         """Draw modern glassmorphism panel"""
-        panel = pygame.Surface((width, height), pygame.SRCALPHA)
-        
-        # Background with gradient
-        for i in range(height):
-            gradient_factor = i / height
-            bg_alpha = int(alpha * (0.8 + 0.2 * gradient_factor))
-            color = (*COLOR_PANEL_BG[:3], bg_alpha)
-            pygame.draw.line(panel, color, (0, i), (width, i))
-        
-        # Border glow
-        border_color = (*COLOR_ACCENT_PRIMARY, 180)
-        pygame.draw.rect(panel, border_color, (0, 0, width, height), 2, border_radius=12)
-        
-        # Inner highlight
-        highlight = (*COLOR_TEXT_PRIMARY, 40)
-        pygame.draw.line(panel, highlight, (12, 3), (width - 12, 3), 1)
-        
-        self.screen.blit(panel, (x, y))
+        rect = self.layout_rect(x, y, width, height)
+        panel = self.widgets.panel(rect.width, rect.height, alpha, COLOR_PANEL_BG,
+                                   (*COLOR_ACCENT_PRIMARY, 180), (*COLOR_TEXT_PRIMARY, 40))
+        rect = self.screen.blit(panel, rect)
+        self.renderer.mark(rect)
+        return rect
 
     def draw_text_with_shadow(self, text, x, y, font, color, center=True, shadow_offset=2):
         """Draw text with drop shadow"""
-        # Shadow
-        shadow = font.render(text, True, (0, 0, 0, 180))
-        shadow_rect = shadow.get_rect(center=(x + shadow_offset, y + shadow_offset)) if center else shadow.get_rect(topleft=(x + shadow_offset, y + shadow_offset))
-        self.screen.blit(shadow, shadow_rect)
-        
-        # Main text
-        text_surf = font.render(text, True, color)
-        text_rect = text_surf.get_rect(center=(x, y)) if center else text_surf.get_rect(topleft=(x, y))
-        self.screen.blit(text_surf, text_rect)
+        if not self.native_text:
+            font, x, y = self.fit(font), self.px(x), self.px(y)
+            shadow_offset = max(1, self.px(shadow_offset)) if shadow_offset else 0
+        # Shadow and text are pre-composited into one cached surface
+        combined = text_cache.render_shadowed(font, text, color, shadow_offset)
+        text_rect = pygame.Rect(0, 0, combined.get_width() - shadow_offset, combined.get_height() - shadow_offset)
+        if center:
+            text_rect.center = (x, y)
+        else:
+            text_rect.topleft = (x, y)
+        if self.native_text:
+            self.renderer.overlay(combined, text_rect.topleft)
+        else:
+            self.renderer.mark(self.screen.blit(combined, text_rect))
         return text_rect
 
+    def draw_text(self, text, font, color, **anchor):
+        """Draw plain text placed by a layout-pixel anchor, e.g. ``center=(x, y)``"""
+        if not self.native_text:
+            font = self.fit(font)
+            anchor = {name: tuple(map(self.px, value)) if isinstance(value, tuple) else self.px(value)
+                      for name, value in anchor.items()}
+        surf = text_cache.render(font, text, color)
+        rect = surf.get_rect(**anchor)
+        if self.native_text:
+            self.renderer.overlay(surf, rect.topleft)
+        else:
+            self.renderer.mark(self.screen.blit(surf, rect))
+        return rect
+
     def draw_progress_bar(self, x, y, width, height, progress, color_start, color_end):
         """Draw modern progress bar with gradient"""
+        rect = self.layout_rect(x, y, width, height)
+        
         # Background
-        bg = pygame.Surface((width, height), pygame.SRCALPHA)
-        bg.fill((30, 35, 50, 200))
-        self.screen.blit(bg, (x, y))
+        self.renderer.mark(self.screen.blit(self.widgets.bar_background(rect.width, rect.height, (30, 35, 50, 200)), rect))
         
-        # Fill
-        fill_width = int(width * progress)
+        # Fill: clip the pre-rendered full-width gradient
+        fill_width = int(rect.width * progress)
         if fill_width > 0:
-            fill = pygame.Surface((fill_width, height), pygame.SRCALPHA)
-            for i in range(fill_width):
-                ratio = i / width
-                r = int(color_start[0] + (color_end[0] - color_start[0]) * ratio)
-                g = int(color_start[1] + (color_end[1] - color_start[1]) * ratio)
-                b = int(color_start[2] + (color_end[2] - color_start[2]) * ratio)
-                pygame.draw.line(fill, (r, g, b), (i, 0), (i, height))
-            self.screen.blit(fill, (x, y))
+            fill = self.widgets.bar_gradient(rect.width, rect.height, color_start, color_end)
+            self.screen.blit(fill, rect, (0, 0, fill_width, rect.height))
         
         # Border
-        pygame.draw.rect(self.screen, COLOR_ACCENT_PRIMARY, (x, y, width, height), 2, border_radius=6)
+        return pygame.draw.rect(self.screen, COLOR_ACCENT_PRIMARY, rect, max(1, self.px(2)), border_radius=self.px(6))
 
     def draw_particles(self):
         """Draw particle effects"""
-        for particle in self.particle_effects[:]:
-            particle['y'] -= particle['speed']
-            particle['x'] += math.sin(particle['y'] * 0.02) * 0.3
-            particle['alpha'] -= 3
-            
-            if particle['alpha'] <= 0:
-                self.particle_effects.remove(particle)
-            else:
-                surf = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-                color = (*particle['color'][:3], particle['alpha'])
-                pygame.draw.circle(surf, color, (particle['size'], particle['size']), particle['size'])
-                self.screen.blit(surf, (int(particle['x']) - particle['size'], int(particle['y']) - particle['size']))
+        # During play the world steps the shared engine; menus age it here
+        if self.state != "PLAYING":
+            self.particles.update()
+        self.renderer.mark(self.particles.draw(self.screen, overlay=True, scale=self.render_scale))
 
     def spawn_particles(self, x, y, count=8, color=COLOR_ACCENT_PRIMARY):
         """Spawn particle burst"""
-        for _ in range(count):
-            self.particle_effects.append({
-                'x': x + random.randint(-20, 20),
-                'y': y + random.randint(-20, 20),
-                'speed': random.uniform(1, 3),
-                'size': random.randint(2, 4),
-                'color': color,
-                'alpha': 255
-            })
+        rng = self.particles.rng
+        count = quality.particles(count)
+        self.particles.emit(count,
+                            x + rng.integers(-20, 21, count),
+                            y + rng.integers(-20, 21, count),
+                            0, -rng.uniform(1, 3, count),
+                            85, rng.integers(2, 5, count), color[:3], FLOAT)
 
     def start_screen(self):
         """Professional start screen UI"""
-        self.draw_starfield()
+        prof = self.profiler
+        with prof.phase("draw.starfield"):
+            self.draw_starfield()
         self.animation_timer += 1
         
         # Title area with accent
         title_y = SCREEN_HEIGHT // 5
         
-        # Animated accent line
-        line_width = 600 + int(50 * math.sin(self.animation_timer * 0.05))
-        pygame.draw.line(self.screen, COLOR_ACCENT_SECONDARY, 
-                        (SCREEN_WIDTH//2 - line_width//2, title_y - 30),
-                        (SCREEN_WIDTH//2 + line_width//2, title_y - 30), 3)
-        
-        # Main title
-        self.draw_text_with_shadow("ASTEROID SHOOTER", SCREEN_WIDTH//2, title_y, 
-                                   self.font_title, COLOR_ACCENT_PRIMARY, shadow_offset=4)
-        
-        # Subtitle
-        pulse = 0.7 + 0.3 * math.sin(self.animation_timer * 0.08)
-        subtitle_color = tuple(int(c * pulse) for c in COLOR_ACCENT_SECONDARY)
-        self.draw_text_with_shadow("AIC Club Expo", SCREEN_WIDTH//2, title_y + 100, 
-                                   self.font_xl, subtitle_color, shadow_offset=2)
-        
-        # Input panel
-        panel_width = 700
-        panel_height = 200
-        panel_x = SCREEN_WIDTH//2 - panel_width//2
-        panel_y = SCREEN_HEIGHT//2 - 50
-        
-        self.draw_glass_panel(panel_x, panel_y, panel_width, panel_height)
-        
-        # Input label
-        self.draw_text_with_shadow("ENTER YOUR NAME", SCREEN_WIDTH//2, panel_y + 50, 
-                                   self.font_lg, COLOR_TEXT_PRIMARY)
-        
-        # Input field
-        input_width = 600
-        input_height = 60
-        input_x = SCREEN_WIDTH//2 - input_width//2
-        input_y = panel_y + 110
-        
-        # Input box with glow
-        glow_alpha = int(80 + 40 * math.sin(self.animation_timer * 0.1))
-        glow_surf = pygame.Surface((input_width + 10, input_height + 10), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surf, (*COLOR_ACCENT_PRIMARY, glow_alpha), (0, 0, input_width + 10, input_height + 10), border_radius=8)
-        self.screen.blit(glow_surf, (input_x - 5, input_y - 5), special_flags=pygame.BLEND_ADD)
-        
-        pygame.draw.rect(self.screen, (35, 40, 55), (input_x, input_y, input_width, input_height), border_radius=8)
-        pygame.draw.rect(self.screen, COLOR_ACCENT_PRIMARY, (input_x, input_y, input_width, input_height), 2, border_radius=8)
-        
-        # Input text
-        self.cursor_blink += 1
-        cursor = "│" if (self.cursor_blink // 25) % 2 == 0 else ""
-        display_text = self.player_name + cursor if self.player_name else "Type here..." + cursor
-        text_color = COLOR_TEXT_PRIMARY if self.player_name else COLOR_TEXT_SECONDARY
-        
-        input_surf = self.font_lg.render(display_text, True, text_color)
-        input_rect = input_surf.get_rect(center=(SCREEN_WIDTH//2, input_y + input_height//2))
-        self.screen.blit(input_surf, input_rect)
-        
-        # Controls info
-        controls_y = SCREEN_HEIGHT - 200
-        control_panel_width = 1000
-        self.draw_glass_panel(SCREEN_WIDTH//2 - control_panel_width//2, controls_y, control_panel_width, 150, alpha=180)
-        
-        controls = [
-            ("◄►", "ROTATE"),
-            ("▲", "THRUST"),
-            ("SPACE", "SHOOT"),
-            ("ESC", "EXIT")
-        ]
-        
-        spacing = control_panel_width // len(controls)
-        for i, (key, desc) in enumerate(controls):
-            x = SCREEN_WIDTH//2 - control_panel_width//2 + spacing//2 + i * spacing
+        with prof.phase("draw.title"):
+            # Animated accent line
+            line_width = 600 + int(50 * math.sin(self.animation_timer * 0.05))
+            self.renderer.mark(pygame.draw.line(self.screen, COLOR_ACCENT_SECONDARY, 
+                            (self.px(SCREEN_WIDTH//2 - line_width//2), self.px(title_y - 30)),
+                            (self.px(SCREEN_WIDTH//2 + line_width//2), self.px(title_y - 30)), max(1, self.px(3))))
+        
+            # Main title
+            self.draw_text_with_shadow("ASTEROID SHOOTER", SCREEN_WIDTH//2, title_y, 
+                                       self.font_title, COLOR_ACCENT_PRIMARY, shadow_offset=4)
+        
+            # Subtitle
+            pulse = 0.7 + 0.3 * math.sin(self.animation_timer * 0.08)
+            subtitle_color = tuple(int(c * pulse) for c in COLOR_ACCENT_SECONDARY)
+            self.draw_text_with_shadow("AIC Club Expo", SCREEN_WIDTH//2, title_y + 100, 
+                                       self.font_xl, subtitle_color, shadow_offset=2)
+        
+        with prof.phase("draw.input"):
+            # Input panel
+            panel_width = 700
+            panel_height = 200
+            panel_x = SCREEN_WIDTH//2 - panel_width//2
+            panel_y = SCREEN_HEIGHT//2 - 50
+        
+            self.draw_glass_panel(panel_x, panel_y, panel_width, panel_height)
+        
+            # Input label
+            self.draw_text_with_shadow("ENTER YOUR NAME", SCREEN_WIDTH//2, panel_y + 50, 
+                                       self.font_lg, COLOR_TEXT_PRIMARY)
+        
+            # Input field
+            input_width = 600
+            input_height = 60
+            input_x = SCREEN_WIDTH//2 - input_width//2
+            input_y = panel_y + 110
+        
+            # Input box with glow
+            glow_alpha = int(80 + 40 * math.sin(self.animation_timer * 0.1))
+            input_rect = self.layout_rect(input_x, input_y, input_width, input_height)
+            glow_rect = self.layout_rect(input_x - 5, input_y - 5, input_width + 10, input_height + 10)
+            glow_surf = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(glow_surf, (*COLOR_ACCENT_PRIMARY, glow_alpha), ((0, 0), glow_rect.size), border_radius=self.px(8))
+            self.renderer.mark(self.screen.blit(glow_surf, glow_rect, special_flags=pygame.BLEND_ADD))
+        
+            pygame.draw.rect(self.screen, (35, 40, 55), input_rect, border_radius=self.px(8))
+            pygame.draw.rect(self.screen, COLOR_ACCENT_PRIMARY, input_rect, max(1, self.px(2)), border_radius=self.px(8))
+        
+            # Input text
+            self.cursor_blink += 1
+            cursor = "│" if (self.cursor_blink // 25) % 2 == 0 else ""
+            display_text = self.player_name + cursor if self.player_name else "Type here..." + cursor
+            text_color = COLOR_TEXT_PRIMARY if self.player_name else COLOR_TEXT_SECONDARY
+        
+            self.draw_text(display_text, self.font_lg, text_color, center=(SCREEN_WIDTH//2, input_y + input_height//2))
+        
+        with prof.phase("draw.controls"):
+            # Controls info
+            controls_y = SCREEN_HEIGHT - 200
+            control_panel_width = 1000
+            self.draw_glass_panel(SCREEN_WIDTH//2 - control_panel_width//2, controls_y, control_panel_width, 150, alpha=180)
+        
+            controls = [
+                ("◄►", "ROTATE"),
+                ("▲", "THRUST"),
+                ("SPACE", "SHOOT"),
+                ("ESC", "EXIT")
+            ]
+        
+            spacing = control_panel_width // len(controls)
+            for i, (key, desc) in enumerate(controls):
+                x = SCREEN_WIDTH//2 - control_panel_width//2 + spacing//2 + i * spacing
             
-            # Key display
-            key_surf = self.font_lg.render(key, True, COLOR_ACCENT_PRIMARY)
-            key_rect = key_surf.get_rect(center=(x, controls_y + 50))
-            self.screen.blit(key_surf, key_rect)
+                # Key display
+                self.draw_text(key, self.font_lg, COLOR_ACCENT_PRIMARY, center=(x, controls_y + 50))
             
-            # Description
-            desc_surf = self.font_sm.render(desc, True, COLOR_TEXT_SECONDARY)
-            desc_rect = desc_surf.get_rect(center=(x, controls_y + 100))
-            self.screen.blit(desc_surf, desc_rect)
-        
-        # Start prompt
-        prompt_alpha = int(200 + 55 * math.sin(self.animation_timer * 0.15))
-        prompt_color = (*COLOR_SUCCESS, prompt_alpha)
-        self.draw_text_with_shadow("PRESS ENTER TO START", SCREEN_WIDTH//2, SCREEN_HEIGHT - 80, 
-                                   self.font_xl, prompt_color)
-        
-        self.draw_particles()
-        pygame.display.flip()
+                # Description
+                self.draw_text(desc, self.font_sm, COLOR_TEXT_SECONDARY, center=(x, controls_y + 100))
+        
+            # Start prompt
+            prompt_alpha = int(200 + 55 * math.sin(self.animation_timer * 0.15))
+            prompt_color = (*COLOR_SUCCESS, prompt_alpha)
+            self.draw_text_with_shadow("PRESS ENTER TO START", SCREEN_WIDTH//2, SCREEN_HEIGHT - 80, 
+                                       self.font_xl, prompt_color)
+        
+        with prof.phase("draw.overlay"):
+            self.draw_particles()
+        self.present()
 
     def game_over_screen(self):
         """Professional game over screen"""
-        self.draw_starfield()
+        prof = self.profiler
+        with prof.phase("draw.starfield"):
+            self.draw_starfield()
         self.animation_timer += 1
         
-        # Red overlay pulse
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        pulse_alpha = int(30 * abs(math.sin(self.animation_timer * 0.06)))
-        overlay.fill((255, 0, 0, pulse_alpha))
-        self.screen.blit(overlay, (0, 0))
-        
-        # Main panel
-        panel_width = 900
-        panel_height = 550
-        panel_x = SCREEN_WIDTH//2 - panel_width//2
-        panel_y = SCREEN_HEIGHT//2 - panel_height//2 - 50
-        
-        self.draw_glass_panel(panel_x, panel_y, panel_width, panel_height)
-        
-        # Game Over title
-        self.draw_text_with_shadow("GAME OVER", SCREEN_WIDTH//2, panel_y + 80, 
-                                   self.font_xxl, COLOR_DANGER, shadow_offset=4)
-        
-        # Stats section
-        stats_y = panel_y + 200
-        
-        # Player
-        self.draw_text_with_shadow("PLAYER", SCREEN_WIDTH//2, stats_y, 
-                                   self.font_sm, COLOR_TEXT_SECONDARY)
-        self.draw_text_with_shadow(self.current_player.upper(), SCREEN_WIDTH//2, stats_y + 40, 
-                                   self.font_xl, COLOR_ACCENT_PRIMARY, shadow_offset=3)
-        
-        # Score
-        self.draw_text_with_shadow("FINAL SCORE", SCREEN_WIDTH//2, stats_y + 120, 
-                                   self.font_sm, COLOR_TEXT_SECONDARY)
-        self.draw_text_with_shadow(str(self.score), SCREEN_WIDTH//2, stats_y + 170, 
-                                   self.font_xxl, COLOR_GOLD, shadow_offset=3)
-        
-        # Rank
-        rank = self.leaderboard.get_player_rank(self.current_player, self.score)
-        self.draw_text_with_shadow(f"WORLD RANK: #{rank}", SCREEN_WIDTH//2, stats_y + 260, 
-                                   self.font_lg, COLOR_SUCCESS)
-        
-        # Continue prompt
-        prompt_pulse = 200 + int(55 * math.sin(self.animation_timer * 0.12))
-        self.draw_text_with_shadow("PRESS ENTER TO CONTINUE", SCREEN_WIDTH//2, panel_y + panel_height - 50, 
-                                   self.font_lg, (*COLOR_ACCENT_PRIMARY, prompt_pulse))
+        with prof.phase("draw.tint"):
+            # Red overlay pulse
+            pulse_alpha = int(30 * abs(math.sin(self.animation_timer * 0.06)))
+            self.renderer.mark(self.tint.draw(self.screen, self.screen.get_rect(), (255, 0, 0), pulse_alpha))
+        
+        with prof.phase("draw.results"):
+            # Main panel
+            panel_width = 900
+            panel_height = 550
+            panel_x = SCREEN_WIDTH//2 - panel_width//2
+            panel_y = SCREEN_HEIGHT//2 - panel_height//2 - 50
+        
+            self.draw_glass_panel(panel_x, panel_y, panel_width, panel_height)
+        
+            # Game Over title
+            self.draw_text_with_shadow("GAME OVER", SCREEN_WIDTH//2, panel_y + 80, 
+                                       self.font_xxl, COLOR_DANGER, shadow_offset=4)
+        
+            # Stats section
+            stats_y = panel_y + 200
+        
+            # Player
+            self.draw_text_with_shadow("PLAYER", SCREEN_WIDTH//2, stats_y, 
+                                       self.font_sm, COLOR_TEXT_SECONDARY)
+            self.draw_text_with_shadow(self.current_player.upper(), SCREEN_WIDTH//2, stats_y + 40, 
+                                       self.font_xl, COLOR_ACCENT_PRIMARY, shadow_offset=3)
+        
+            # Score
+            self.draw_text_with_shadow("FINAL SCORE", SCREEN_WIDTH//2, stats_y + 120, 
+                                       self.font_sm, COLOR_TEXT_SECONDARY)
+            self.draw_text_with_shadow(str(self.world.score), SCREEN_WIDTH//2, stats_y + 170, 
+                                       self.font_xxl, COLOR_GOLD, shadow_offset=3)
+        
+            # Rank
+            rank = self.leaderboard.get_player_rank(self.current_player, self.world.score)
+            self.draw_text_with_shadow(f"WORLD RANK: #{rank}", SCREEN_WIDTH//2, stats_y + 260, 
+                                       self.font_lg, COLOR_SUCCESS)
+        
+            # Continue prompt
+            prompt_pulse = 200 + int(55 * math.sin(self.animation_timer * 0.12))
+            self.draw_text_with_shadow("PRESS ENTER TO CONTINUE", SCREEN_WIDTH//2, panel_y + panel_height - 50, 
+                                       self.font_lg, (*COLOR_ACCENT_PRIMARY, prompt_pulse))
         
         # Side leaderboard
-        self.draw_mini_leaderboard(SCREEN_WIDTH - 370, 50)
+        with prof.phase("draw.leaderboard"):
+            self.draw_mini_leaderboard(SCREEN_WIDTH - 370, 50)
         
-        self.draw_particles()
-        pygame.display.flip()
+        with prof.phase("draw.overlay"):
+            self.draw_particles()
+        self.present()
 
     def leaderboard_screen(self):
         """Professional full leaderboard"""
-        self.draw_starfield()
+        prof = self.profiler
+        with prof.phase("draw.starfield"):
+            self.draw_starfield()
         self.animation_timer += 1
         
-        # Title
-        self.draw_text_with_shadow("🏆 HALL OF FAME", SCREEN_WIDTH//2, 100, 
-                                   self.font_xxl, COLOR_GOLD, shadow_offset=4)
-        
-        # Main panel
-        panel_width = 1100
-        panel_height = SCREEN_HEIGHT - 400
-        panel_x = SCREEN_WIDTH//2 - panel_width//2
-        panel_y = 200
-        
-        self.draw_glass_panel(panel_x, panel_y, panel_width, panel_height)
-        
-        # Headers
-        header_y = panel_y + 40
-        headers = [
-            ("RANK", panel_x + 80),
-            ("PLAYER", panel_x + 350),
-            ("SCORE", panel_x + 700),
-            ("DATE", panel_x + 920)
-        ]
-        
-        for header, x in headers:
-            self.draw_text_with_shadow(header, x, header_y, self.font_md, COLOR_ACCENT_PRIMARY, center=True, shadow_offset=1)
-        
-        # Divider
-        pygame.draw.line(self.screen, COLOR_ACCENT_SECONDARY, 
-                        (panel_x + 40, header_y + 40), 
-                        (panel_x + panel_width - 40, header_y + 40), 2)
-        
-        # Scores
-        scores = self.leaderboard.get_top_scores()
-        entry_y = header_y + 80
-        
-        for i, entry in enumerate(scores[:12]):
-            # Rank color
-            if i == 0:
-                rank_color = COLOR_GOLD
-            elif i == 1:
-                rank_color = COLOR_SILVER
-            elif i == 2:
-                rank_color = COLOR_BRONZE
-            else:
-                rank_color = COLOR_TEXT_PRIMARY
+        with prof.phase("draw.title"):
+            # Title
+            self.draw_text_with_shadow("🏆 HALL OF FAME", SCREEN_WIDTH//2, 100, 
+                                       self.font_xxl, COLOR_GOLD, shadow_offset=4)
+        
+        with prof.phase("draw.table"):
+            # Main panel
+            panel_width = 1100
+            panel_height = SCREEN_HEIGHT - 400
+            panel_x = SCREEN_WIDTH//2 - panel_width//2
+            panel_y = 200
+        
+            self.draw_glass_panel(panel_x, panel_y, panel_width, panel_height)
+        
+            # Headers
+            header_y = panel_y + 40
+            headers = [
+                ("RANK", panel_x + 80),
+                ("PLAYER", panel_x + 350),
+                ("SCORE", panel_x + 700),
+                ("DATE", panel_x + 920)
+            ]
+        
+            for header, x in headers:
+                self.draw_text_with_shadow(header, x, header_y, self.font_md, COLOR_ACCENT_PRIMARY, center=True, shadow_offset=1)
+        
+            # Divider
+            self.renderer.mark(pygame.draw.line(self.screen, COLOR_ACCENT_SECONDARY, 
+                            (self.px(panel_x + 40), self.px(header_y + 40)), 
+                            (self.px(panel_x + panel_width - 40), self.px(header_y + 40)), max(1, self.px(2))))
+        
+            # Scores
+            scores = self.leaderboard.get_top_scores(12)
+            entry_y = header_y + 80
+        
+            for i, entry in enumerate(scores):
+                # Rank color
+                if i == 0:
+                    rank_color = COLOR_GOLD
+                elif i == 1:
+                    rank_color = COLOR_SILVER
+                elif i == 2:
+                    rank_color = COLOR_BRONZE
+                else:
+                    rank_color = COLOR_TEXT_PRIMARY
             
-            # Highlight top 3
-            if i < 3:
-                highlight = pygame.Surface((panel_width - 80, 50), pygame.SRCALPHA)
-                highlight.fill((*rank_color, 20))
-                self.screen.blit(highlight, (panel_x + 40, entry_y - 20))
+                # Highlight top 3
+                if i < 3:
+                    self.renderer.mark(self.tint.draw(self.screen, self.layout_rect(panel_x + 40, entry_y - 20, panel_width - 80, 50),
+                                                      rank_color, 20))
             
-            # Data
-            rank_text = f"#{i+1}"
-            name = entry['name'][:20]
-            score = str(entry['score'])
-            date = entry.get('timestamp', 'N/A')[:10]
+                # Data
+                rank_text = f"#{i+1}"
+                name = entry['name'][:20]
+                score = str(entry['score'])
+                date = entry.get('timestamp', 'N/A')[:10]
             
-            # Draw entry
-            self.draw_text_with_shadow(rank_text, panel_x + 80, entry_y, self.font_lg, rank_color, shadow_offset=1)
-            self.draw_text_with_shadow(name, panel_x + 350, entry_y, self.font_lg, COLOR_TEXT_PRIMARY, shadow_offset=1)
-            self.draw_text_with_shadow(score, panel_x + 700, entry_y, self.font_lg, COLOR_ACCENT_PRIMARY if i < 3 else COLOR_TEXT_PRIMARY, shadow_offset=1)
-            self.draw_text_with_shadow(date, panel_x + 920, entry_y, self.font_sm, COLOR_TEXT_SECONDARY, shadow_offset=1)
+                # Draw entry
+                self.draw_text_with_shadow(rank_text, panel_x + 80, entry_y, self.font_lg, rank_color, shadow_offset=1)
+                self.draw_text_with_shadow(name, panel_x + 350, entry_y, self.font_lg, COLOR_TEXT_PRIMARY, shadow_offset=1)
+                self.draw_text_with_shadow(score, panel_x + 700, entry_y, self.font_lg, COLOR_ACCENT_PRIMARY if i < 3 else COLOR_TEXT_PRIMARY, shadow_offset=1)
+                self.draw_text_with_shadow(date, panel_x + 920, entry_y, self.font_sm, COLOR_TEXT_SECONDARY, shadow_offset=1)
             
-            entry_y += 55
-        
-        # No scores
-        if not scores:
-            self.draw_text_with_shadow("NO SCORES YET - BE THE FIRST!", 
-                                      SCREEN_WIDTH//2, SCREEN_HEIGHT//2, 
-                                      self.font_xl, COLOR_ACCENT_PRIMARY)
-        
-        # Instructions
-        inst_y = SCREEN_HEIGHT - 120
-        self.draw_glass_panel(SCREEN_WIDTH//2 - 400, inst_y, 800, 80, alpha=200)
-        self.draw_text_with_shadow("ENTER: Next Player  │  Q: Quit", 
-                                  SCREEN_WIDTH//2, inst_y + 40, 
-                                  self.font_lg, COLOR_TEXT_PRIMARY)
-        
-        self.draw_particles()
-        pygame.display.flip()
+                entry_y += 55
+        
+            # No scores
+            if not scores:
+                self.draw_text_with_shadow("NO SCORES YET - BE THE FIRST!", 
+                                          SCREEN_WIDTH//2, SCREEN_HEIGHT//2, 
+                                          self.font_xl, COLOR_ACCENT_PRIMARY)
+        
+        with prof.phase("draw.footer"):
+            # Instructions
+            inst_y = SCREEN_HEIGHT - 120
+            self.draw_glass_panel(SCREEN_WIDTH//2 - 400, inst_y, 800, 80, alpha=200)
+            self.draw_text_with_shadow("ENTER: Next Player  │  Q: Quit", 
+                                      SCREEN_WIDTH//2, inst_y + 40, 
+                                      self.font_lg, COLOR_TEXT_PRIMARY)
+        
+        with prof.phase("draw.overlay"):
+            self.draw_particles()
+        self.present()
 
     def draw_mini_leaderboard(self, x, y):
         """Draw compact leaderboard"""
@@ -437,51 +555,67 @@ class Game:
             score = str(entry['score'])
             
             # Name
-            name_surf = self.font_sm.render(f"{i+1}. {name}", True, color)
-            self.screen.blit(name_surf, (x + 20, entry_y))
+            self.draw_text(f"{i+1}. {name}", self.font_sm, color, topleft=(x + 20, entry_y))
             
             # Score
-            score_surf = self.font_md.render(score, True, COLOR_ACCENT_PRIMARY)
-            score_rect = score_surf.get_rect(right=x + panel_width - 20, centery=entry_y + 10)
-            self.screen.blit(score_surf, score_rect)
+            self.draw_text(score, self.font_md, COLOR_ACCENT_PRIMARY, right=x + panel_width - 20, centery=entry_y + 10)
             
             entry_y += 60
 
     def draw_game(self):
         """Professional gameplay UI"""
         game_width = SCREEN_WIDTH - 400
+        prof = self.profiler
         
-        self.draw_starfield()
+        with prof.phase("draw.starfield"):
+            self.draw_starfield()
         
         # Game area border
-        for i in range(5):
-            alpha = 60 - i * 12
-            pygame.draw.line(self.screen, (*COLOR_ACCENT_PRIMARY, alpha), 
-                           (game_width + i, 0), (game_width + i, SCREEN_HEIGHT))
-        
-        # Draw entities
-        self.player.draw(self.screen)
-        self.bullets.draw(self.screen)
-        self.asteroids.draw(self.screen)
-        self.explosions.draw(self.screen)
-        
+        border_x, border_steps = self.px(game_width), max(1, self.px(5))
+        for i in range(border_steps):
+            alpha = 60 - i * 60 // border_steps
+            self.renderer.mark(pygame.draw.line(self.screen, (*COLOR_ACCENT_PRIMARY, alpha), 
+                           (border_x + i, 0), (border_x + i, self.screen.get_height())))
+        
+        # Draw entities, interpolated between their last two ticks
+        alpha = self.timestep.alpha
+        scale = self.render_scale
+        with prof.phase("draw.player"):
+            self.renderer.mark(self.world.player.draw(self.screen, alpha, scale))
+        with prof.phase("draw.bullets"):
+            self.renderer.mark(self.world.bullets.draw(self.screen, alpha, scale))
+        with prof.phase("draw.asteroids"):
+            self.renderer.mark(self.world.asteroids.draw(self.screen, alpha, scale))
+        with prof.phase("draw.particles"):
+            self.renderer.mark(self.particles.draw(self.screen, scale=scale))
+        
+        with prof.phase("draw.hud"):
+            self.draw_hud(game_width)
+        
+        with prof.phase("draw.overlay"):
+            self.draw_particles()
+        self.present()
+
+    def draw_hud(self, game_width):
+        """Gameplay HUD panels"""
         # HUD - Player & Score
         self.draw_glass_panel(20, 20, 300, 120)
         self.draw_text_with_shadow(f"👤 {self.current_player[:12]}", 30, 50, 
                                    self.font_md, COLOR_ACCENT_PRIMARY, center=False, shadow_offset=1)
-        self.draw_text_with_shadow(f"SCORE: {self.score}", 30, 95, 
+        self.draw_text_with_shadow(f"SCORE: {self.world.score}", 30, 95, 
                                    self.font_lg, COLOR_GOLD, center=False, shadow_offset=2)
         
         # Lives
         self.draw_glass_panel(20, 160, 300, 100)
         self.draw_text_with_shadow("LIVES", 30, 185, self.font_sm, COLOR_TEXT_SECONDARY, center=False)
         
-        for i in range(self.lives):
+        for i in range(self.world.lives):
             ship_x = 40 + i * 70
             ship_y = 225
-            points = [(ship_x+10, ship_y-8), (ship_x, ship_y+8), (ship_x+20, ship_y+8)]
+            points = [(self.px(ship_x+10), self.px(ship_y-8)), (self.px(ship_x), self.px(ship_y+8)),
+                      (self.px(ship_x+20), self.px(ship_y+8))]
             pygame.draw.polygon(self.screen, COLOR_ACCENT_PRIMARY, points)
-            pygame.draw.polygon(self.screen, COLOR_TEXT_PRIMARY, points, 1)
+            self.renderer.mark(pygame.draw.polygon(self.screen, COLOR_TEXT_PRIMARY, points, 1))
         
         # Timer
         timer_width = 350
@@ -490,7 +624,7 @@ class Game:
         
         self.draw_text_with_shadow("TIME", game_width//2, 50, self.font_sm, COLOR_TEXT_SECONDARY)
         
-        time_remaining = int(self.time_left)
+        time_remaining = int(self.world.time_left)
         if time_remaining > 15:
             time_color = COLOR_SUCCESS
         elif time_remaining > 5:
@@ -504,7 +638,7 @@ class Game:
         # Progress bar
         bar_width = 300
         bar_x = game_width//2 - bar_width//2
-        progress = max(0, self.time_left / 30.0)
+        progress = max(0, self.world.time_left / 30.0)
         
         if progress > 0.6:
             bar_colors = (COLOR_SUCCESS, COLOR_SUCCESS)
@@ -526,56 +660,161 @@ class Game:
                                    self.font_md, COLOR_ACCENT_PRIMARY)
         
         stats = [
-            (f"Asteroids: {len(self.asteroids.asteroids)}", stats_y + 75),
-            (f"Bullets: {len(self.bullets.bullets)}", stats_y + 110),
+            (f"Asteroids: {len(self.world.asteroids.asteroids)}", stats_y + 75),
+            (f"Bullets: {len(self.world.bullets.bullets)}", stats_y + 110),
             (f"High: {self.leaderboard.get_high_score()}", stats_y + 145)
         ]
         
         for text, y_pos in stats:
             self.draw_text_with_shadow(text, SCREEN_WIDTH - 360, y_pos, 
                                       self.font_sm, COLOR_TEXT_PRIMARY, center=False)
-        
-        self.draw_particles()
-        pygame.display.flip()
 
-    def reset_game(self):
-        self.score = 0
-        self.lives = 3
-        self.time_left = 30.0
-        self.player = Player(SCREEN_WIDTH//4, SCREEN_HEIGHT//2, sound_manager=self.sound_manager.play)
-        self.asteroids = AsteroidManager(SCREEN_WIDTH - 400, SCREEN_HEIGHT)
-        self.bullets = BulletManager(self.bullet_font, sound_manager=self.sound_manager.play)
-        self.explosions = ExplosionManager()
-        self.asteroids.spawn_initial()
+    def present(self):
+        """Draw the profiler overlay if shown, then push the frame to the display"""
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+        with self.profiler.phase("flip"):
+            self.renderer.present()
+
+    def draw_profiler_overlay(self):
+        """Rolling per-phase timings in milliseconds, pool occupancy, quality level and voices"""
+        stats = self.profiler.summary()
+        pool_stats = {name: pool.stats() for name, pool in pools.items()}
+        pool_stats["particles"] = self.particles.stats()
+        
+        rows = [(f"{'PHASE':<16}{'MEAN':>8}{'P95':>8}{'P99':>8}", COLOR_ACCENT_PRIMARY)]
+        for name, s in sorted(stats.items()):
+            rows.append((f"{name:<16}{s['mean']:>8.2f}{s['p95']:>8.2f}{s['p99']:>8.2f}", COLOR_TEXT_PRIMARY))
+        rows.append((f"{'POOL':<16}{'LIVE':>8}{'FREE':>8}{'PEAK':>8}", COLOR_ACCENT_PRIMARY))
+        for name, s in pool_stats.items():
+            rows.append((f"{name:<16}{s['live']:>8}{s['free']:>8}{s['high_water']:>8}", COLOR_TEXT_PRIMARY))
+        if self.governor is not None:
+            switches = len(self.governor.switches)
+            rows.append((f"{'QUALITY':<16}{quality.name:>8}{switches:>8} switches", COLOR_ACCENT_PRIMARY))
+        sound = self.sound_manager.stats()
+        rows.append((f"{'SOUND':<16}{'PLAYED':>8}{'DROPPED':>8}{'STOLEN':>8}", COLOR_ACCENT_PRIMARY))
+        rows.append((f"{'voices':<16}{sound['played']:>8}{sound['dropped']:>8}{sound['stolen']:>8}",
+                     COLOR_TEXT_PRIMARY))
+        
+        row_height = 22
+        width, height = 460, 40 + row_height * len(rows)
+        x, y = 20, SCREEN_HEIGHT - height - 20
+        self.draw_glass_panel(x, y, width, height, alpha=230)
+        for i, (line, color) in enumerate(rows):
+            self.draw_text_with_shadow(line, x + 20, y + 15 + i * row_height,
+                                       self.font_mono, color, center=False, shadow_offset=1)
+
+    def toggle_profiler(self):
+        self.show_profiler = not self.show_profiler
+        self.profiler.enabled = self.show_profiler
+        self.renderer.invalidate()
+
+    def export_profile(self):
+        basename = time.strftime("profile-%Y%m%d-%H%M%S")
+        extra = {"sound": self.sound_manager.stats()}
+        if self.governor is not None:
+            extra["quality"] = self.governor.stats()
+        for path in self.profiler.export(basename, extra):
+            print(f"Profile written to {path}")
+
+    def reset_game(self, seed=None, record=RECORD_SESSIONS):
+        # The round is a pure function of this seed and the player's inputs
+        # Close the previous recording first: its footer takes the old World's score
+        self.stop_recording()
+        if self.world is not None:
+            self.world.release_entities()
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        random.seed(seed)
+        self.particles.seed(seed)
+        self.world = World(SCREEN_WIDTH, SCREEN_HEIGHT, hud_width=400, fps=FPS,
+                           bullet_font=self.fit(self.bullet_font),
+                           sound_manager=self.sound_manager.play,
+                           particle_spawner=self.spawn_particles,
+                           particles=self.particles,
+                           profiler=self.profiler)
+        self.timestep.reset()
+        
+        if record:
+            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            name = "".join(c for c in self.current_player if c.isalnum()) or "player"
+            path = os.path.join(RECORDINGS_DIR, time.strftime(f"%Y%m%d-%H%M%S-{name}.rec"))
+            self.recorder = Recorder(path, seed, self.world, self.current_player, FPS)
+            prune_recordings(RECORDINGS_DIR, MAX_RECORDINGS)
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close(self.world.score)
+            self.recorder = None
+
+    def quit(self):
+        # Every exit path (window close, ESC, q) comes through here, so
+        # closing the leaderboard flushes its writer before the process ends
+        self.stop_recording()
+        self.leaderboard.close()
+        pygame.quit()
+        sys.exit()
 
     def run(self):
+        drawn_state = None
+        prof = self.profiler
         while True:
-            self.clock.tick(FPS)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-                if self.state == "START_SCREEN":
-                    self.handle_start_screen(event)
-                elif self.state == "PLAYING":
-                    self.handle_game_events(event)
-                elif self.state == "GAME_OVER":
-                    self.handle_game_over(event)
-                elif self.state == "LEADERBOARD":
-                    self.handle_leaderboard(event)
+            frame_time = self.clock.tick(RENDER_FPS) / 1000.0
+            frame_start = time.perf_counter()
+            
+            with prof.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.quit()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                        self.quit()
+                    if event.type == pygame.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+                        self.toggle_profiler()
+                        continue
+                    if event.type == pygame.KEYDOWN and event.key == PROFILER_EXPORT_KEY:
+                        self.export_profile()
+                        continue
+                    if self.state == "START_SCREEN":
+                        self.handle_start_screen(event)
+                    elif self.state == "PLAYING":
+                        self.handle_game_events(event)
+                    elif self.state == "GAME_OVER":
+                        self.handle_game_over(event)
+                    elif self.state == "LEADERBOARD":
+                        self.handle_leaderboard(event)
+
+            if self.state != drawn_state:
+                drawn_state = self.state
+                self.renderer.invalidate()
+            if self.state != "PLAYING":
+                # No simulation ticks here: each frame starts a new sound tick
+                self.sound_manager.new_tick()
 
             if self.state == "START_SCREEN":
                 self.start_screen()
             elif self.state == "PLAYING":
-                self.update_game()
-                self.draw_game()
+                for _ in range(self.timestep.advance(frame_time)):
+                    self.update_game()
+                if self.state == "PLAYING":
+                    self.draw_game()
             elif self.state == "GAME_OVER":
                 self.game_over_screen()
             elif self.state == "LEADERBOARD":
                 self.leaderboard_screen()
+            
+            if self.quality_rebuild is not None:
+                with prof.phase("quality"):
+                    if next(self.quality_rebuild, StopIteration) is StopIteration:
+                        self.quality_rebuild = None
+            
+            frame_work = time.perf_counter() - frame_start
+            if trace.enabled and not trace.reported:
+                trace.record("first frame", frame_work)
+                trace.finish()
+            if prof.enabled:
+                prof.record("frame", frame_work)
+            if self.governor is not None and self.state == "PLAYING":
+                self.governor.update(frame_work * 1000.0)
 
     def handle_start_screen(self, event):
         if event.type == pygame.KEYDOWN:
@@ -591,8 +830,8 @@ class Game:
 
     def handle_game_over(self, event):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-            self.leaderboard.add_score(self.current_player, self.score)
-            self.leaderboard.save()
+            self.leaderboard.add_score(self.current_player, self.world.score)
+            self.leaderboard.save()  # Hands off to the writer thread; the rank shows now
             self.state = "LEADERBOARD"
 
     def handle_leaderboard(self, event):
@@ -600,8 +839,7 @@ class Game:
             if event.key == pygame.K_RETURN:
                 self.state = "START_SCREEN"
             elif event.key == pygame.K_q:
-                pygame.quit()
-                sys.exit()
+                self.quit()
 
     def next_player(self):
         self.current_player = self.players_queue.pop(0) if self.players_queue else "Player1"
@@ -611,70 +849,42 @@ class Game:
     def handle_game_events(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_LEFT:
-                self.player.rotating_left = True
+                self.world.player.rotating_left = True
             elif event.key == pygame.K_RIGHT:
-                self.player.rotating_right = True
+                self.world.player.rotating_right = True
             elif event.key == pygame.K_UP:
-                self.player.thrusting = True
+                self.world.player.thrusting = True
             elif event.key == pygame.K_SPACE:
-                self.player.shooting = True
+                self.world.player.shooting = True
         elif event.type == pygame.KEYUP:
             if event.key == pygame.K_LEFT:
-                self.player.rotating_left = False
+                self.world.player.rotating_left = False
             elif event.key == pygame.K_RIGHT:
-                self.player.rotating_right = False
+                self.world.player.rotating_right = False
             elif event.key == pygame.K_UP:
-                self.player.thrusting = False
+                self.world.player.thrusting = False
             elif event.key == pygame.K_SPACE:
-                self.player.shooting = False
+                self.world.player.shooting = False
 
     def update_game(self):
         if self.state != "PLAYING":
             return
         
         self.animation_timer += 1
-        self.player.update()
-        self.bullets.update()
-        self.asteroids.update()
-        self.explosions.update()
-        
-        if self.player.shooting:
-            bullet_info = self.player.shoot()
-            if bullet_info:
-                bullet = Bullet(*bullet_info, font=self.bullet_font, sound_manager=self.sound_manager.play)
-                self.bullets.add(bullet)
-        
-        self.handle_collisions()
-        self.time_left -= 1.0 / FPS
-        
-        if self.lives <= 0 or self.time_left <= 0:
-            self.time_left = max(0, self.time_left)
+        self.sound_manager.new_tick()
+        if self.recorder is not None:
+            self.recorder.tick(self.world)
+        self.world.update()
+        
+        if self.world.game_over:
+            self.stop_recording()
             self.state = "GAME_OVER"
             self.sound_manager.play('explosion')
 
-    def handle_collisions(self):
-        for bullet in self.bullets.bullets[:]:
-            for asteroid in self.asteroids.asteroids[:]:
-                if asteroid.rect.collidepoint(bullet.pos):
-                    self.score += asteroid.point_value
-                    self.explosions.create_explosion(asteroid.pos, asteroid.size * 10, 'asteroid')
-                    self.asteroids.destroy(asteroid)
-                    if bullet in self.bullets.bullets:
-                        self.bullets.bullets.remove(bullet)
-                    self.sound_manager.play('hit')
-                    self.spawn_particles(asteroid.pos.x, asteroid.pos.y, 12, COLOR_WARNING)
-                    break
-        
-        for asteroid in self.asteroids.asteroids:
-            if asteroid.rect.colliderect(self.player.rect):
-                self.lives -= 1
-                self.explosions.create_explosion(self.player.pos, 30, 'normal')
-                self.player.respawn()
-                self.sound_manager.play('explosion')
-                self.spawn_particles(self.player.pos.x, self.player.pos.y, 15, COLOR_DANGER)
-                break
-
 
 if __name__ == "__main__":
+    # Print how long each part of startup took
+    trace.enabled = "--trace-startup" in sys.argv
+    trace.mark("imports")
     game = Game()
     game.run()
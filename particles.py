@@ -0,0 +1,189 @@
+import numpy as np
+import pygame
+from stamps import stamps
+
+# Particle styles: how a particle moves, fades and is drawn
+SPARK = 0    # Explosion debris: drag, shrinks late in life, glow + core
+TRAIL = 1    # Bullet trail: stationary additive dot
+THRUST = 2   # Engine exhaust: additive dot shrinking with age
+FLOAT = 3    # UI burst: rises and wobbles, drawn over the HUD
+
+DRAG = np.array([0.92, 1.0, 1.0, 1.0], dtype=np.float32)
+WOBBLE = np.array([False, False, False, True])
+OVERLAY = np.array([False, False, False, True])
+
+
+class ParticleEngine:
+    """Structure-of-arrays particle store shared by every particle effect.
+
+    Particles live in preallocated NumPy arrays and are moved, aged and
+    culled with vectorized operations; dead slots are filled by swapping
+    in live particles from the tail. Effects are emitters that append
+    bursts through ``emit``. When the store is full, extra particles are
+    dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, capacity=4096, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.high_water = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.lifespan = np.ones(capacity, dtype=np.int32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alpha = np.zeros(capacity, dtype=np.int32)
+        self.style = np.zeros(capacity, dtype=np.uint8)
+        self._arrays = (self.pos, self.vel, self.age, self.lifespan,
+                        self.radius, self.color, self.alpha, self.style)
+
+    def __len__(self):
+        return self.count
+
+    def stats(self):
+        """Same shape as ``Pool.stats``: particles live in preallocated slots"""
+        return {
+            "live": self.count,
+            "free": self.capacity - self.count,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+        }
+
+    def seed(self, seed):
+        """Restart the random stream so effects repeat, e.g. in a replay"""
+        self.rng = np.random.default_rng(seed)
+
+    def emit(self, count, x, y, vx, vy, lifespan, radius, color, style, alpha=255):
+        """Append ``count`` particles.
+
+        Every argument is either a scalar (``color`` an RGB tuple) or a
+        per-particle array of length ``count``.
+        """
+        room = self.capacity - self.count
+        if count > room:
+            self.dropped += count - room
+            count = room
+        if count <= 0:
+            return
+        s = slice(self.count, self.count + count)
+        self.pos[s, 0] = _head(x, count)
+        self.pos[s, 1] = _head(y, count)
+        self.vel[s, 0] = _head(vx, count)
+        self.vel[s, 1] = _head(vy, count)
+        self.age[s] = 0
+        self.lifespan[s] = _head(lifespan, count)
+        self.radius[s] = _head(radius, count)
+        self.color[s] = color[:count] if np.ndim(color) == 2 else color
+        self.alpha[s] = alpha
+        self.style[s] = style
+        self.count += count
+        self.high_water = max(self.high_water, self.count)
+
+    def emit_radial(self, count, x, y, speed, lifespan, radius, color_lo, color_hi, style):
+        """Emit ``count`` particles flying out in random directions.
+
+        ``speed``, ``lifespan`` and ``radius`` are (low, high) ranges; the
+        integer ranges are inclusive like ``random.randint``.
+        """
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        spd = rng.uniform(speed[0], speed[1], count)
+        colors = rng.integers(color_lo, np.add(color_hi, 1), size=(count, 3))
+        self.emit(count, x, y, spd * np.cos(angle), spd * np.sin(angle),
+                  rng.integers(lifespan[0], lifespan[1] + 1, count),
+                  rng.integers(radius[0], radius[1] + 1, count),
+                  colors, style)
+
+    def clear(self, style=None):
+        """Remove every particle, or only those of one style"""
+        if style is None:
+            self.count = 0
+        else:
+            self._compact(self.style[:self.count] != style)
+
+    def update(self):
+        n = self.count
+        if n == 0:
+            return
+        pos, vel, style = self.pos[:n], self.vel[:n], self.style[:n]
+        pos += vel
+        vel *= DRAG[style][:, None]
+
+        wobble = WOBBLE[style]
+        if wobble.any():
+            pos[wobble, 0] += np.sin(pos[wobble, 1] * 0.02) * 0.3
+
+        age = self.age[:n]
+        age += 1
+        late = (style == SPARK) & (age > self.lifespan[:n] // 2)
+        if late.any():
+            self.radius[:n][late] = np.maximum(1, self.radius[:n][late] - 0.1)
+
+        alive = age < self.lifespan[:n]
+        if not alive.all():
+            self._compact(alive)
+
+    def _compact(self, alive):
+        """Fill dead slots below the new count with live particles from the tail"""
+        live = int(np.count_nonzero(alive))
+        holes = np.flatnonzero(~alive[:live])
+        movers = np.flatnonzero(alive[live:]) + live
+        if len(holes):
+            for array in self._arrays:
+                array[holes] = array[movers]
+        self.count = live
+
+    def draw(self, screen, overlay=False, scale=1.0):
+        """Draw either the world-space particles or the HUD overlay layer.
+
+        ``scale`` maps positions and sizes onto a reduced-resolution
+        render target. Returns the list of rects touched.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        style = self.style[:n]
+        idx = np.flatnonzero(OVERLAY[style] == overlay)
+        if len(idx) == 0:
+            return []
+
+        age = self.age[idx]
+        life = self.lifespan[idx]
+        alpha = (self.alpha[idx] * (life - age) // life).tolist()
+        radius = self.radius[idx]
+        thrust = style[idx] == THRUST
+        radius[thrust] = (4 * (life[thrust] - age[thrust]) / life[thrust]).astype(np.int32)
+        pos = self.pos[idx]
+        trail = 3
+        if scale != 1.0:
+            pos = pos * scale
+            radius = radius * scale
+            trail = max(1, round(3 * scale))
+
+        blits = []
+        for s, (x, y), r, color, a in zip(style[idx].tolist(), pos.tolist(),
+                                           radius.tolist(), self.color[idx].tolist(), alpha):
+            if a <= 0:
+                continue
+            if s == SPARK:
+                glow = stamps.get(int(r * 2), color, a // 3)
+                blits.append((glow, (x - r * 2, y - r * 2), None, pygame.BLEND_ADD))
+                blits.append((stamps.get(int(r), color, a), (x - r, y - r), None, 0))
+            elif s == TRAIL:
+                blits.append((stamps.get(trail, (255, 255, 0), a), (x - trail, y - trail), None, pygame.BLEND_ADD))
+            elif s == THRUST:
+                r = int(r)
+                if r > 0:
+                    blits.append((stamps.get(r, (255, 180, 50), a), (x - r, y - r), None, pygame.BLEND_ADD))
+            else:
+                r = int(r)
+                blits.append((stamps.get(r, color, a), (int(x) - r, int(y) - r), None, 0))
+        return screen.blits(blits)
+
+
+def _head(value, count):
+    return value[:count] if np.ndim(value) else value
+
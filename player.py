@@ -1,11 +1,24 @@
 import pygame
 import math
 import random
+import numpy as np
 import time
+from particles import THRUST
+from stamps import stamps
+from compositor import ScratchLayer, bounding_rect
+from timestep import lerp_position
+
+# Shared scratch buffer for the additive engine flames
+_flame_layer = ScratchLayer()
+
+# Cosmetic flicker has its own stream so drawing never perturbs the
+# global RNG the simulation (and session replay) depends on
+_flicker = random.Random()
 
 class Player:
-    def __init__(self, x, y, sound_manager=None):
+    def __init__(self, x, y, sound_manager=None, particles=None):
         self.pos = pygame.Vector2(x, y)
+        self.prev_pos = self.pos.copy()
         self.radius = 20
         self.angle = 0
         self.speed = pygame.Vector2(0, 0)
@@ -23,12 +36,13 @@ class Player:
         self.update_rect()
         self.sound_manager = sound_manager
         self.thrust_start_time = None
-        self.thrust_particles = []
+        self.particles = particles
 
     def update_rect(self):
         self.rect.center = (int(self.pos.x), int(self.pos.y))
 
-    def update(self):
+    def update(self, bounds):
+        self.prev_pos.update(self.pos)
         if self.rotating_left:
             self.angle += 4
         if self.rotating_right:
@@ -46,21 +60,8 @@ class Player:
                 self.thrust_start_time = time.time()
 
             # Spawn thrust particles
-            for _ in range(3):
-                offset_angle = self.angle + 180 + random.uniform(-20, 20)
-                speed_p = random.uniform(2, 4)
-                dx = math.cos(math.radians(offset_angle)) * speed_p
-                dy = -math.sin(math.radians(offset_angle)) * speed_p
-                particle_pos = pygame.Vector2(
-                    self.pos.x - math.cos(rad) * self.radius * 1.2,
-                    self.pos.y + math.sin(rad) * self.radius * 1.2
-                )
-                self.thrust_particles.append({
-                    'pos': particle_pos,
-                    'vel': pygame.Vector2(dx, dy),
-                    'age': 0,
-                    'max_age': random.randint(15, 25)
-                })
+            if self.particles is not None:
+                self.emit_thrust(rad)
         else:
             self.thrust_start_time = None
 
@@ -69,7 +70,7 @@ class Player:
             self.speed.scale_to_length(self.max_speed)
         self.pos += self.speed
 
-        screen_width, screen_height = pygame.display.get_surface().get_size()
+        screen_width, screen_height = bounds
         if self.pos.x < 0:
             self.pos.x = screen_width
         elif self.pos.x > screen_width:
@@ -83,12 +84,16 @@ class Player:
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
 
-        # Update thrust particles
-        for particle in self.thrust_particles[:]:
-            particle['pos'] += particle['vel']
-            particle['age'] += 1
-            if particle['age'] >= particle['max_age']:
-                self.thrust_particles.remove(particle)
+    def emit_thrust(self, rad):
+        rng = self.particles.rng
+        offset_angle = np.radians(self.angle + 180 + rng.uniform(-20, 20, 3))
+        speed_p = rng.uniform(2, 4, 3)
+        self.particles.emit(3,
+                            self.pos.x - math.cos(rad) * self.radius * 1.2,
+                            self.pos.y + math.sin(rad) * self.radius * 1.2,
+                            np.cos(offset_angle) * speed_p,
+                            -np.sin(offset_angle) * speed_p,
+                            rng.integers(15, 26, 3), 4, (255, 180, 50), THRUST)
 
     def shoot(self):
         if self.shoot_cooldown == 0:
@@ -101,50 +106,53 @@ class Player:
             return bullet_pos.x, bullet_pos.y, bullet_vel.x, bullet_vel.y
         return None
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, scale=1.0):
+        # ``scale`` maps world pixels onto a reduced-resolution render target
+        pos = lerp_position(self.prev_pos, self.pos, alpha) * scale
+        radius = self.radius * scale
         rad = math.radians(self.angle)
         
         # SLEEK FUTURISTIC SPACESHIP DESIGN
         
         # Main body - elongated hexagon
         front_tip = (
-            self.pos.x + math.cos(rad) * self.radius * 2.5,
-            self.pos.y - math.sin(rad) * self.radius * 2.5
+            pos.x + math.cos(rad) * radius * 2.5,
+            pos.y - math.sin(rad) * radius * 2.5
         )
         
         front_left = (
-            self.pos.x + math.cos(rad + 0.4) * self.radius * 1.8,
-            self.pos.y - math.sin(rad + 0.4) * self.radius * 1.8
+            pos.x + math.cos(rad + 0.4) * radius * 1.8,
+            pos.y - math.sin(rad + 0.4) * radius * 1.8
         )
         
         front_right = (
-            self.pos.x + math.cos(rad - 0.4) * self.radius * 1.8,
-            self.pos.y - math.sin(rad - 0.4) * self.radius * 1.8
+            pos.x + math.cos(rad - 0.4) * radius * 1.8,
+            pos.y - math.sin(rad - 0.4) * radius * 1.8
         )
         
         mid_left = (
-            self.pos.x + math.cos(rad + 1.2) * self.radius * 1.3,
-            self.pos.y - math.sin(rad + 1.2) * self.radius * 1.3
+            pos.x + math.cos(rad + 1.2) * radius * 1.3,
+            pos.y - math.sin(rad + 1.2) * radius * 1.3
         )
         
         mid_right = (
-            self.pos.x + math.cos(rad - 1.2) * self.radius * 1.3,
-            self.pos.y - math.sin(rad - 1.2) * self.radius * 1.3
+            pos.x + math.cos(rad - 1.2) * radius * 1.3,
+            pos.y - math.sin(rad - 1.2) * radius * 1.3
         )
         
         back_left = (
-            self.pos.x + math.cos(rad + 2.8) * self.radius * 0.7,
-            self.pos.y - math.sin(rad + 2.8) * self.radius * 0.7
+            pos.x + math.cos(rad + 2.8) * radius * 0.7,
+            pos.y - math.sin(rad + 2.8) * radius * 0.7
         )
         
         back_right = (
-            self.pos.x + math.cos(rad - 2.8) * self.radius * 0.7,
-            self.pos.y - math.sin(rad - 2.8) * self.radius * 0.7
+            pos.x + math.cos(rad - 2.8) * radius * 0.7,
+            pos.y - math.sin(rad - 2.8) * radius * 0.7
         )
         
         back_center = (
-            self.pos.x - math.cos(rad) * self.radius * 0.8,
-            self.pos.y + math.sin(rad) * self.radius * 0.8
+            pos.x - math.cos(rad) * radius * 0.8,
+            pos.y + math.sin(rad) * radius * 0.8
         )
         
         # Main body gradient (dark to bright)
@@ -152,59 +160,61 @@ class Player:
         
         # Draw body with gradient effect
         pygame.draw.polygon(screen, (20, 80, 120), body_points)
-        pygame.draw.polygon(screen, (0, 200, 255), body_points, 3)
+        pygame.draw.polygon(screen, (0, 200, 255), body_points, max(1, round(3 * scale)))
         
         # Side panels/wings (extended)
         wing_left_outer = (
-            self.pos.x + math.cos(rad + 1.8) * self.radius * 2.2,
-            self.pos.y - math.sin(rad + 1.8) * self.radius * 2.2
+            pos.x + math.cos(rad + 1.8) * radius * 2.2,
+            pos.y - math.sin(rad + 1.8) * radius * 2.2
         )
         
         wing_right_outer = (
-            self.pos.x + math.cos(rad - 1.8) * self.radius * 2.2,
-            self.pos.y - math.sin(rad - 1.8) * self.radius * 2.2
+            pos.x + math.cos(rad - 1.8) * radius * 2.2,
+            pos.y - math.sin(rad - 1.8) * radius * 2.2
         )
         
         # Draw wings
         pygame.draw.polygon(screen, (10, 60, 100), [mid_left, wing_left_outer, back_left])
-        pygame.draw.polygon(screen, (0, 150, 200), [mid_left, wing_left_outer, back_left], 2)
+        pygame.draw.polygon(screen, (0, 150, 200), [mid_left, wing_left_outer, back_left], max(1, round(2 * scale)))
         
         pygame.draw.polygon(screen, (10, 60, 100), [mid_right, wing_right_outer, back_right])
-        pygame.draw.polygon(screen, (0, 150, 200), [mid_right, wing_right_outer, back_right], 2)
+        pygame.draw.polygon(screen, (0, 150, 200), [mid_right, wing_right_outer, back_right], max(1, round(2 * scale)))
         
         # Cockpit (glowing center)
         cockpit_center = (
-            self.pos.x + math.cos(rad) * self.radius * 0.8,
-            self.pos.y - math.sin(rad) * self.radius * 0.8
+            pos.x + math.cos(rad) * radius * 0.8,
+            pos.y - math.sin(rad) * radius * 0.8
         )
         
         # Cockpit glow
-        glow_surf = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surf, (0, 255, 255, 100), (15, 15), 15)
-        screen.blit(glow_surf, (cockpit_center[0] - 15, cockpit_center[1] - 15), special_flags=pygame.BLEND_ADD)
+        glow_size = round(15 * scale)
+        glow_surf = stamps.get(glow_size, (0, 255, 255), 100)
+        screen.blit(glow_surf, (cockpit_center[0] - glow_size, cockpit_center[1] - glow_size), special_flags=pygame.BLEND_ADD)
         
-        pygame.draw.circle(screen, (100, 255, 255), (int(cockpit_center[0]), int(cockpit_center[1])), 5)
-        pygame.draw.circle(screen, (0, 200, 255), (int(cockpit_center[0]), int(cockpit_center[1])), 5, 1)
+        cockpit_radius = max(1, round(5 * scale))
+        pygame.draw.circle(screen, (100, 255, 255), (int(cockpit_center[0]), int(cockpit_center[1])), cockpit_radius)
+        pygame.draw.circle(screen, (0, 200, 255), (int(cockpit_center[0]), int(cockpit_center[1])), cockpit_radius, 1)
         
         # Engine details (two smaller circles at back)
         engine_left = (
-            self.pos.x + math.cos(rad + 2.5) * self.radius * 0.5,
-            self.pos.y - math.sin(rad + 2.5) * self.radius * 0.5
+            pos.x + math.cos(rad + 2.5) * radius * 0.5,
+            pos.y - math.sin(rad + 2.5) * radius * 0.5
         )
         
         engine_right = (
-            self.pos.x + math.cos(rad - 2.5) * self.radius * 0.5,
-            self.pos.y - math.sin(rad - 2.5) * self.radius * 0.5
+            pos.x + math.cos(rad - 2.5) * radius * 0.5,
+            pos.y - math.sin(rad - 2.5) * radius * 0.5
         )
         
-        pygame.draw.circle(screen, (50, 150, 200), (int(engine_left[0]), int(engine_left[1])), 3)
-        pygame.draw.circle(screen, (50, 150, 200), (int(engine_right[0]), int(engine_right[1])), 3)
+        engine_radius = max(1, round(3 * scale))
+        pygame.draw.circle(screen, (50, 150, 200), (int(engine_left[0]), int(engine_left[1])), engine_radius)
+        pygame.draw.circle(screen, (50, 150, 200), (int(engine_right[0]), int(engine_right[1])), engine_radius)
 
         # Thrust flame effect
         if self.thrusting:
             # Left engine flame
             flame_base_left = engine_left
-            flame_length = 15 + random.randint(-3, 3)
+            flame_length = (15 + _flicker.randint(-3, 3)) * scale
             flame_tip_left = (
                 flame_base_left[0] - math.cos(rad) * flame_length,
                 flame_base_left[1] + math.sin(rad) * flame_length
@@ -242,35 +252,32 @@ class Player:
             flame_color_inner = (255, flicker, 0, 255)
             flame_color_outer = (255, 100, 0, 180)
             
-            flame_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            flame_left = [flame_base_left, flame_side_left1, flame_tip_left, flame_side_left2]
+            flame_right = [flame_base_right, flame_side_right1, flame_tip_right, flame_side_right2]
+            
+            # Composite only the flames' bounding box
+            _flame_layer.begin(bounding_rect(flame_left + flame_right, pad=1))
             
             # Draw flames
-            pygame.draw.polygon(flame_surface, flame_color_outer, 
-                              [flame_base_left, flame_side_left1, flame_tip_left, flame_side_left2])
-            pygame.draw.polygon(flame_surface, flame_color_inner, 
-                              [flame_base_left, flame_side_left1, flame_tip_left, flame_side_left2], 1)
+            _flame_layer.polygon(flame_color_outer, flame_left)
+            _flame_layer.polygon(flame_color_inner, flame_left, 1)
             
-            pygame.draw.polygon(flame_surface, flame_color_outer, 
-                              [flame_base_right, flame_side_right1, flame_tip_right, flame_side_right2])
-            pygame.draw.polygon(flame_surface, flame_color_inner, 
-                              [flame_base_right, flame_side_right1, flame_tip_right, flame_side_right2], 1)
+            _flame_layer.polygon(flame_color_outer, flame_right)
+            _flame_layer.polygon(flame_color_inner, flame_right, 1)
             
-            screen.blit(flame_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+            _flame_layer.composite(screen, special_flags=pygame.BLEND_ADD)
 
-        # Draw thrust particles
-        for particle in self.thrust_particles:
-            alpha = int(255 * (1 - particle['age'] / particle['max_age']))
-            color = (255, 180, 50, alpha)
-            size = int(4 * (1 - particle['age'] / particle['max_age']))
-            if size > 0:
-                surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, color, (size, size), size)
-                screen.blit(surf, (particle['pos'].x - size, particle['pos'].y - size), special_flags=pygame.BLEND_ADD)
+        # Conservative bounds of hull, wings, cockpit glow and flames
+        bounds = pygame.Rect(0, 0, math.ceil(radius * 6), math.ceil(radius * 6))
+        bounds.center = (int(pos.x), int(pos.y))
+        return bounds
 
     def respawn(self):
         self.pos = self.respawn_pos.copy()
+        self.prev_pos = self.pos.copy()
         self.speed = pygame.Vector2(0, 0)
         self.angle = 0
         self.update_rect()
         self.thrust_start_time = None
-        self.thrust_particles.clear()
+        if self.particles is not None:
+            self.particles.clear(THRUST)
@@ -0,0 +1,58 @@
+class Pool:
+    """Free list of reusable entity instances.
+
+    ``acquire`` hands back a released instance re-initialised in place via
+    its ``reset`` method, or builds a new one when the free list is empty.
+    ``release`` returns an instance for reuse; the caller must drop every
+    other reference to it. At most ``max_free`` idle instances are kept.
+    """
+
+    def __init__(self, factory, name, max_free=256):
+        self.factory = factory
+        self.name = name
+        self.max_free = max_free
+        self.free = []
+        self.live = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+        pools[name] = self
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        self.adopt()
+        return obj
+
+    def adopt(self):
+        """Count an instance that entered play without ``acquire`` (e.g. unpickled)"""
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+
+    def release(self, obj):
+        self.live -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def release_all(self, objs):
+        for obj in objs:
+            self.release(obj)
+
+    def stats(self):
+        return {
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+
+# Every Pool by name, for the profiler overlay and benchmarks
+pools = {}
@@ -0,0 +1,110 @@
+import csv
+import json
+import time
+from contextlib import nullcontext
+import numpy as np
+
+_NULL_PHASE = nullcontext()
+
+
+class _Phase:
+    """Reusable timing context for one named phase"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in fixed-size ring buffers.
+
+    ``phase(name)`` returns a context manager timing the enclosed block.
+    While the profiler is disabled it hands back a shared no-op context,
+    so instrumented code costs one attribute check and an empty ``with``.
+    Timings are stored in milliseconds; each phase keeps its last
+    ``size`` samples.
+    """
+
+    def __init__(self, size=600, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.buffers = {}
+        self.counts = {}
+        self._phases = {}
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def record(self, name, seconds):
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = self.buffers[name] = np.zeros(self.size)
+            self.counts[name] = 0
+        count = self.counts[name]
+        buffer[count % self.size] = seconds * 1000.0
+        self.counts[name] = count + 1
+
+    def samples(self, name):
+        """Samples for a phase in recording order, oldest first"""
+        buffer, count = self.buffers[name], self.counts[name]
+        if count <= self.size:
+            return buffer[:count]
+        start = count % self.size
+        return np.concatenate((buffer[start:], buffer[:start]))
+
+    def reset(self):
+        self.buffers.clear()
+        self.counts.clear()
+
+    def summary(self):
+        """Rolling mean/p95/p99 in milliseconds per phase"""
+        stats = {}
+        for name in self.buffers:
+            data = self.samples(name)
+            if len(data) == 0:
+                continue
+            p95, p99 = np.percentile(data, (95, 99))
+            stats[name] = {
+                "mean": float(data.mean()),
+                "p95": float(p95),
+                "p99": float(p99),
+                "samples": len(data),
+            }
+        return stats
+
+    def export(self, basename, extra=None):
+        """Write the ring buffers to ``basename``.csv and ``basename``.json.
+
+        ``extra`` is merged into the JSON document, e.g. quality switches.
+        """
+        with open(f"{basename}.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "sample", "ms"])
+            for name in self.buffers:
+                for i, value in enumerate(self.samples(name)):
+                    writer.writerow([name, i, f"{value:.4f}"])
+
+        document = {
+            "summary": self.summary(),
+            "samples": {name: self.samples(name).round(4).tolist() for name in self.buffers},
+        }
+        document.update(extra or {})
+        with open(f"{basename}.json", "w") as f:
+            json.dump(document, f, indent=4)
+        return f"{basename}.csv", f"{basename}.json"
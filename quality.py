@@ -0,0 +1,141 @@
+from collections import deque
+
+# Cheapest-to-drop effects go first; every level only touches cosmetics,
+# never the simulation, so recordings replay the same at any level
+LEVELS = [
+    {"name": "high", "particle_scale": 1.0, "bullet_trails": True, "bullet_glow": True,
+     "asteroid_detail": True, "star_density": 1.0},
+    {"name": "medium", "particle_scale": 0.5, "bullet_trails": False, "bullet_glow": True,
+     "asteroid_detail": True, "star_density": 0.75},
+    {"name": "low", "particle_scale": 0.25, "bullet_trails": False, "bullet_glow": False,
+     "asteroid_detail": False, "star_density": 0.5},
+    {"name": "minimal", "particle_scale": 0.1, "bullet_trails": False, "bullet_glow": False,
+     "asteroid_detail": False, "star_density": 0.25},
+]
+
+
+class QualitySettings:
+    """The effect switches for the current quality level.
+
+    Entities read the shared ``quality`` instance when they emit or draw:
+    particle bursts are scaled by ``particles``, bullets check
+    ``bullet_trails``/``bullet_glow``, asteroids check ``asteroid_detail``
+    (craters and glow) and the starfield is rebuilt at ``star_density``.
+    """
+
+    def __init__(self, level=0):
+        self.apply(level)
+
+    def apply(self, level):
+        self.level = level
+        settings = LEVELS[level]
+        self.name = settings["name"]
+        self.particle_scale = settings["particle_scale"]
+        self.bullet_trails = settings["bullet_trails"]
+        self.bullet_glow = settings["bullet_glow"]
+        self.asteroid_detail = settings["asteroid_detail"]
+        self.star_density = settings["star_density"]
+
+    def particles(self, count):
+        """Scale a burst's particle count, keeping at least one particle"""
+        if self.particle_scale >= 1.0:
+            return count
+        return max(1, int(count * self.particle_scale))
+
+
+class QualityGovernor:
+    """Steps the quality level to keep the rolling frame time inside a budget.
+
+    Once ``window`` frames are collected, a mean above ``budget_ms *
+    down_ratio`` drops a level. Raising one takes ``up_windows``
+    consecutive windows with a mean below ``budget_ms * up_ratio``, and
+    every time a raise is undone by the next switch that dwell doubles
+    (up to ``max_up_windows``), so a level that cannot hold is retried
+    less and less often. ``on_change`` is called with the settings after
+    each switch, and every switch is kept in ``switches`` for
+    instrumentation; ``verbose`` also prints them.
+    """
+
+    def __init__(self, settings, budget_ms, window=90, down_ratio=1.15, up_ratio=0.6,
+                 up_windows=3, max_up_windows=48, on_change=None, verbose=False):
+        self.settings = settings
+        self.budget_ms = budget_ms
+        self.window = window
+        self.down_ratio = down_ratio
+        self.up_ratio = up_ratio
+        self.up_windows = up_windows
+        self.max_up_windows = max_up_windows
+        self.on_change = on_change
+        self.verbose = verbose
+        self.samples = deque(maxlen=window)
+        self.total = 0.0
+        self.frames = 0
+        self.good_windows = 0
+        self.required_windows = up_windows
+        self.switches = []
+
+    def reset(self):
+        self.samples.clear()
+        self.total = 0.0
+
+    def mean_ms(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def update(self, frame_ms):
+        """Feed one frame's work time; returns True when the level changed"""
+        self.frames += 1
+        if len(self.samples) == self.window:
+            self.total -= self.samples[0]
+        self.samples.append(frame_ms)
+        self.total += frame_ms
+        if len(self.samples) < self.window:
+            return False
+
+        mean = self.mean_ms()
+        level = self.settings.level
+        if mean > self.budget_ms * self.down_ratio and level < len(LEVELS) - 1:
+            self.switch(level + 1, mean)
+            return True
+        if mean < self.budget_ms * self.up_ratio and level > 0:
+            # Count whole windows: start a fresh one after each good window
+            self.good_windows += 1
+            self.reset()
+            if self.good_windows >= self.required_windows:
+                self.switch(level - 1, mean)
+                return True
+        else:
+            self.good_windows = 0
+        return False
+
+    def switch(self, level, mean):
+        old_level, old = self.settings.level, self.settings.name
+        if level > old_level and self.switches and self.switches[-1]["raised"]:
+            # The last raise did not hold: wait longer before the next one
+            self.required_windows = min(self.required_windows * 2, self.max_up_windows)
+        self.settings.apply(level)
+        self.switches.append({
+            "frame": self.frames,
+            "from": old,
+            "to": self.settings.name,
+            "mean_ms": round(mean, 3),
+            "raised": level < old_level,
+        })
+        if self.verbose:
+            print(f"Quality {old} -> {self.settings.name} (mean frame {mean:.1f} ms, "
+                  f"budget {self.budget_ms:.1f} ms)")
+        self.good_windows = 0
+        self.reset()
+        if self.on_change:
+            self.on_change(self.settings)
+
+    def stats(self):
+        return {
+            "level": self.settings.name,
+            "mean_ms": self.mean_ms(),
+            "budget_ms": self.budget_ms,
+            "switches": list(self.switches),
+        }
+
+
+# Shared by every entity that draws or emits effects
+quality = QualitySettings()
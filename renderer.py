@@ -0,0 +1,127 @@
+import math
+
+import pygame
+
+
+class DirtyRectRenderer:
+    """Presents only the screen regions touched since the previous frame.
+
+    Draw code reports every rect it touches through ``mark``. At the start
+    of a frame the static background is restored under last frame's
+    rects only, and ``present`` pushes the union of last and current
+    rects with ``pygame.display.update``. When those rects cover more
+    than ``threshold`` of the screen, a full flip is cheaper and is used
+    instead. With ``enabled`` False every frame is a plain full flip.
+
+    When ``screen`` is an offscreen target smaller than ``display`` (a
+    reduced internal render resolution), presenting upscales it onto the
+    display in one pass: the whole surface on a full flip, only the dirty
+    regions otherwise. Surfaces handed to ``overlay`` (e.g. HUD text kept
+    at native resolution) are blitted onto the display after that; rects
+    given to ``mark`` are always in ``screen`` coordinates.
+    """
+
+    def __init__(self, screen, enabled=False, threshold=0.5, display=None, smooth=False):
+        self.screen = screen
+        self.display = screen if display is None else display
+        self.enabled = enabled
+        self.threshold = threshold
+        self.smooth = smooth
+        self.background = None
+        self.rects = []
+        self.prev_rects = []
+        self.overlays = []
+        self.full_redraw = True
+        self.full_flips = 0
+        self.partial_updates = 0
+        # Display pixels per screen pixel along each axis
+        self.scale_x = self.display.get_width() / screen.get_width()
+        self.scale_y = self.display.get_height() / screen.get_height()
+
+    @property
+    def scaled(self):
+        return self.display is not self.screen
+
+    def set_background(self, surface):
+        """Static backdrop that dirty regions are restored from"""
+        self.background = surface
+        self.invalidate()
+
+    def invalidate(self):
+        """Repaint and present the whole screen on the next frame"""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.prev_rects:
+                self.screen.blit(self.background, rect, rect)
+
+    def mark(self, rect):
+        """Record a touched rect (or an iterable of rects)"""
+        if rect is None:
+            return
+        if isinstance(rect, pygame.Rect):
+            self.rects.append(rect)
+        else:
+            self.rects.extend(r for r in rect if r is not None)
+
+    def overlay(self, surface, dest):
+        """Blit ``surface`` at display position ``dest`` after upscaling; returns its display rect"""
+        rect = surface.get_rect(topleft=dest)
+        self.overlays.append((surface, rect))
+        self.mark(self.to_screen(rect))
+        return rect
+
+    def to_screen(self, rect):
+        """Screen-space rect covering a display-space rect"""
+        left = math.floor(rect.left / self.scale_x)
+        top = math.floor(rect.top / self.scale_y)
+        return pygame.Rect(left, top,
+                           math.ceil(rect.right / self.scale_x) - left,
+                           math.ceil(rect.bottom / self.scale_y) - top)
+
+    def upscale(self, rect=None):
+        """Scale ``rect`` of the screen (all of it by default) onto the display; returns the display rect"""
+        transform = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        if rect is None:
+            transform(self.screen, self.display.get_size(), self.display)
+            return self.display.get_rect()
+        left = math.floor(rect.left * self.scale_x)
+        top = math.floor(rect.top * self.scale_y)
+        dest = pygame.Rect(left, top,
+                           math.ceil(rect.right * self.scale_x) - left,
+                           math.ceil(rect.bottom * self.scale_y) - top)
+        self.display.blit(transform(self.screen.subsurface(rect), dest.size), dest)
+        return dest
+
+    def present(self):
+        full = not self.enabled or self.full_redraw
+        if not full:
+            bounds = self.screen.get_rect()
+            # HUD widgets touch the same rects every frame; push them once
+            unique = {tuple(r.clip(bounds)) for r in self.prev_rects + self.rects}
+            dirty = [pygame.Rect(r) for r in unique if r[2] and r[3]]
+            area = sum(r.width * r.height for r in dirty)
+            full = area > self.threshold * bounds.width * bounds.height
+        if full:
+            if self.scaled:
+                self.upscale()
+            self.draw_overlays()
+            pygame.display.flip()
+            self.full_flips += 1
+            self.full_redraw = False
+        else:
+            if self.scaled:
+                dirty = [self.upscale(r) for r in dirty]
+            self.draw_overlays()
+            pygame.display.update(dirty)
+            self.partial_updates += 1
+        self.prev_rects = self.rects
+        self.rects = []
+
+    def draw_overlays(self):
+        if self.overlays:
+            self.display.blits([(surface, rect, None, 0) for surface, rect in self.overlays], False)
+            self.overlays = []
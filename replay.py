@@ -0,0 +1,330 @@
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from world import World
+
+# File layout:
+#   header    magic, version, seed, tick rate, playfield size, HUD width, player name
+#   chunks    'I' input change (tick, mask), 'K' keyframe (tick, zlib'd World.snapshot)
+#   'E'       end of stream (tick count, final score)
+#   index     keyframe (tick, file offset) pairs, then a footer pointing at the index
+# Inputs are only written when they change, so a 30s round is a few hundred bytes
+# plus its keyframes.
+MAGIC = b"ASREC"
+VERSION = 1
+HEADER = struct.Struct("<5sBQHHHHB")
+CHUNK = struct.Struct("<cI")
+INPUT = struct.Struct("<B")
+KEYFRAME = struct.Struct("<I")
+END = struct.Struct("<i")
+INDEX_ENTRY = struct.Struct("<IQ")
+FOOTER = struct.Struct("<IQ5s")
+
+ROTATE_LEFT = 1
+ROTATE_RIGHT = 2
+THRUST = 4
+SHOOT = 8
+
+
+def input_mask(player):
+    return ((ROTATE_LEFT if player.rotating_left else 0) |
+            (ROTATE_RIGHT if player.rotating_right else 0) |
+            (THRUST if player.thrusting else 0) |
+            (SHOOT if player.shooting else 0))
+
+
+def apply_input(player, mask):
+    player.rotating_left = bool(mask & ROTATE_LEFT)
+    player.rotating_right = bool(mask & ROTATE_RIGHT)
+    player.thrusting = bool(mask & THRUST)
+    player.shooting = bool(mask & SHOOT)
+
+
+class Recorder:
+    """Streams one round's per-tick inputs to a binary recording.
+
+    Call ``tick`` once per simulation tick, before ``World.update``, and
+    ``close`` when the round ends. Every ``keyframe_interval`` ticks the
+    full World state is written too, so replays can seek without
+    re-simulating from the start.
+    """
+
+    def __init__(self, path, seed, world, player="", tick_rate=60, keyframe_interval=600):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = []
+        self.ticks = 0
+        self.mask = None
+        name = player.encode("utf-8")[:255]
+        width, height = world.bounds
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, tick_rate, width, height,
+                                    world.hud_width, len(name)) + name)
+
+    def tick(self, world):
+        if self.ticks and self.ticks % self.keyframe_interval == 0:
+            self.keyframes.append((self.ticks, self.file.tell()))
+            data = zlib.compress(world.snapshot())
+            self.file.write(CHUNK.pack(b"K", self.ticks) + KEYFRAME.pack(len(data)) + data)
+
+        mask = input_mask(world.player)
+        if mask != self.mask:
+            self.mask = mask
+            self.file.write(CHUNK.pack(b"I", self.ticks) + INPUT.pack(mask))
+        self.ticks += 1
+
+    def close(self, score):
+        if self.file.closed:
+            return
+        self.file.write(CHUNK.pack(b"E", self.ticks) + END.pack(score))
+        index_offset = self.file.tell()
+        for entry in self.keyframes:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(FOOTER.pack(len(self.keyframes), index_offset, MAGIC))
+        self.file.close()
+
+
+class Recording:
+    """A recording's header and keyframe index; chunks are streamed on demand.
+
+    A file whose footer is missing (the game was killed mid-round) is
+    indexed by scanning its chunks, and replays up to its last chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        magic, version, self.seed, self.tick_rate, width, height, self.hud_width, name_len = \
+            HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        self.bounds = (width, height)
+        self.player = self.file.read(name_len).decode("utf-8")
+        self.data_start = self.file.tell()
+        self.ticks = None
+        self.score = None
+        self.keyframes = []
+        if not self.read_index():
+            self.scan()
+
+    def read_index(self):
+        f = self.file
+        f.seek(0, os.SEEK_END)
+        if f.tell() - self.data_start < FOOTER.size:
+            return False
+        f.seek(-FOOTER.size, os.SEEK_END)
+        count, index_offset, magic = FOOTER.unpack(f.read(FOOTER.size))
+        if magic != MAGIC:
+            return False
+        f.seek(index_offset)
+        self.keyframes = [INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size)) for _ in range(count)]
+        # The end chunk sits right before the index
+        f.seek(index_offset - CHUNK.size - END.size)
+        _, self.ticks = CHUNK.unpack(f.read(CHUNK.size))
+        self.score, = END.unpack(f.read(END.size))
+        return True
+
+    def scan(self):
+        for kind, tick, offset, payload in self.chunks(self.data_start):
+            if kind == b"K":
+                self.keyframes.append((tick, offset))
+
+    def chunks(self, offset):
+        """Yield ``(kind, tick, offset, payload)`` from ``offset`` up to the end chunk.
+
+        Input payloads are the mask. Keyframe payloads are their data size;
+        the data itself is skipped and read with ``keyframe(offset)``.
+        """
+        f = self.file
+        while True:
+            f.seek(offset)
+            head = f.read(CHUNK.size)
+            if len(head) < CHUNK.size:
+                return
+            kind, tick = CHUNK.unpack(head)
+            if kind == b"I":
+                payload, = INPUT.unpack(f.read(INPUT.size))
+                next_offset = f.tell()
+            elif kind == b"K":
+                payload, = KEYFRAME.unpack(f.read(KEYFRAME.size))
+                next_offset = f.tell() + payload
+            elif kind == b"E":
+                self.ticks = tick
+                self.score, = END.unpack(f.read(END.size))
+                return
+            else:
+                return
+            yield kind, tick, offset, payload
+            offset = next_offset
+
+    def keyframe(self, offset):
+        f = self.file
+        f.seek(offset + CHUNK.size)
+        size, = KEYFRAME.unpack(f.read(KEYFRAME.size))
+        return zlib.decompress(f.read(size))
+
+    def close(self):
+        self.file.close()
+
+
+class Replayer:
+    """Feeds a recording's inputs into a World one tick at a time.
+
+    The World must have been built right after ``random.seed(recording.seed)``
+    (``start`` does this for a World it builds itself). Each ``step``
+    applies the tick's input changes to the player and runs ``update``,
+    which defaults to ``world.update`` and can be a Game's ``update_game``.
+    """
+
+    def __init__(self, recording, world):
+        self.recording = recording
+        self.world = world
+        self.tick = 0
+        self.pending = None
+        self.stream = recording.chunks(recording.data_start)
+
+    @classmethod
+    def start(cls, recording, **world_kwargs):
+        random.seed(recording.seed)
+        width, height = recording.bounds
+        world = World(width, height, hud_width=recording.hud_width, fps=recording.tick_rate,
+                      **world_kwargs)
+        world.particles.seed(recording.seed)
+        return cls(recording, world)
+
+    def seek(self, tick):
+        """Jump to ``tick`` from the nearest keyframe at or before it"""
+        rec = self.recording
+        keyframe = None
+        for entry in rec.keyframes:
+            if entry[0] <= tick:
+                keyframe = entry
+        # Going backwards, or past a keyframe, restarts; otherwise just run forward
+        if tick < self.tick or (keyframe and keyframe[0] > self.tick):
+            if keyframe:
+                self.tick, offset = keyframe
+                self.world.restore(rec.keyframe(offset))
+            else:
+                random.seed(rec.seed)
+                self.world.reset()
+                self.tick, offset = 0, rec.data_start
+            self.stream = rec.chunks(offset)
+            self.pending = None
+        while self.tick < tick and self.step():
+            pass
+
+    def finished(self):
+        ticks = self.recording.ticks
+        if ticks is not None:
+            return self.tick >= ticks
+        # Unterminated recording: stop after its last chunk
+        return self.pending is None and self.stream is None
+
+    def step(self, update=None):
+        """Apply this tick's inputs and advance one tick; False once the recording ends"""
+        while True:
+            if self.pending is None:
+                self.pending = next(self.stream, None) if self.stream else None
+                if self.pending is None:
+                    self.stream = None
+                    break
+            kind, tick, _, payload = self.pending
+            if tick > self.tick:
+                break
+            if kind == b"I":
+                apply_input(self.world.player, payload)
+            self.pending = None
+
+        if self.finished():
+            return False
+        (update or self.world.update)()
+        self.tick += 1
+        return True
+
+
+def prune_recordings(directory, keep):
+    """Delete all but the ``keep`` newest .rec files in ``directory``"""
+    try:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".rec")]
+    except OSError:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Error removing old recording: {e}")
+
+
+def replay_headless(path, seek=None):
+    """Re-simulate a recording as fast as possible; returns (World, ticks, seconds)"""
+    recording = Recording(path)
+    replayer = Replayer.start(recording)
+    start = time.perf_counter()
+    if seek:
+        replayer.seek(seek)
+    while replayer.step():
+        pass
+    elapsed = time.perf_counter() - start
+    recording.close()
+    return replayer.world, replayer.tick, elapsed
+
+
+def replay_realtime(path, seek=None):
+    """Play a recording back through a Game window at the recorded tick rate"""
+    import pygame
+    import main
+
+    recording = Recording(path)
+    main.SCREEN_WIDTH, main.SCREEN_HEIGHT = recording.bounds
+    game = main.Game(fullscreen=False)
+    game.current_player = recording.player or "REPLAY"
+    game.reset_game(seed=recording.seed, record=False)
+    game.state = "PLAYING"
+    replayer = Replayer(recording, game.world)
+    if seek:
+        replayer.seek(seek)
+
+    playing = True
+    while playing:
+        frame_time = game.clock.tick(main.RENDER_FPS) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                playing = False
+        for _ in range(game.timestep.advance(frame_time)):
+            if not replayer.step(game.update_game):
+                playing = False
+                break
+        if game.state == "PLAYING":
+            game.draw_game()
+    recording.close()
+    pygame.quit()
+    return game.world, replayer.tick
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded session")
+    parser.add_argument("path")
+    parser.add_argument("--realtime", action="store_true", help="watch it in a window instead of re-simulating")
+    parser.add_argument("--seek", type=int, default=None, help="start from this tick")
+    args = parser.parse_args()
+
+    if args.realtime:
+        world, ticks = replay_realtime(args.path, args.seek)
+        print(f"{ticks} ticks, score {world.score}")
+        sys.exit(0)
+
+    world, ticks, elapsed = replay_headless(args.path, args.seek)
+    recording = Recording(args.path)
+    print(f"{recording.player or 'unnamed'}: {ticks} ticks in {elapsed:.2f}s, score {world.score}")
+    if recording.score is not None:
+        if recording.score == world.score:
+            print(f"Verified: matches the recorded score {recording.score}")
+        else:
+            print(f"MISMATCH: recorded score {recording.score}")
+            sys.exit(1)
+    recording.close()
@@ -1,15 +1,58 @@
 import pygame
 import os
 
+from asset_registry import assets, init_pygame
+
+# Per sound: priority (higher wins when voices run out) and how many
+# channels are kept for it alone
+SOUND_CHANNELS = {
+    "game_over": {"priority": 3, "reserved": 1},
+    "explosion": {"priority": 2, "reserved": 2},
+    "hit": {"priority": 1, "reserved": 2},
+    "thrust": {"priority": 1, "reserved": 1},
+    "shoot": {"priority": 0, "reserved": 2},
+}
+DEFAULT_CHANNEL = {"priority": 0, "reserved": 0}
+MAX_VOICES = 16
+
 class SoundManager:
-    def __init__(self):
+    """Loads the game sounds and schedules them onto mixer channels"""
+
+    def __init__(self, max_voices=MAX_VOICES):
+        init_pygame()
         pygame.mixer.init()
         self.sounds = {}
         self.volume = 0.5
+        self.max_voices = max_voices
+        # Keys played since new_tick (every simulation tick while playing,
+        # every frame on the menus); a repeat within a tick plays once
+        self.tick_keys = set()
+        self.started = 0
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.deduped = 0
+        self.setup_channels()
         self.load_sounds()
 
+    def setup_channels(self):
+        reserved = sum(config["reserved"] for config in SOUND_CHANNELS.values())
+        count = max(self.max_voices, reserved)
+        pygame.mixer.set_num_channels(count)
+        # Keep stray Sound.play() calls from picking our channels
+        pygame.mixer.set_reserved(count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+        # (key, priority, start order) of what each channel last played
+        self.voices = [None] * count
+        self.owned = {}
+        index = 0
+        for key, config in SOUND_CHANNELS.items():
+            self.owned[key] = list(range(index, index + config["reserved"]))
+            index += config["reserved"]
+        self.shared = list(range(index, count))
+
     def load_sounds(self):
-        """Load all game sounds from assets/sounds directory"""
+        """Queue all game sounds from assets/sounds for background decoding"""
         base_path = os.path.join("assets", "sounds")
         sound_files = {
             "shoot": "shoot.wav",
@@ -25,27 +68,79 @@ class SoundManager:
             print(f"Created sounds directory: {base_path}")
             print("Please add sound files (.wav format) to this directory")
         
-        for key, filename in sound_files.items():
-            path = os.path.join(base_path, filename)
-            if os.path.exists(path):
-                try:
-                    self.sounds[key] = pygame.mixer.Sound(path)
-                    self.sounds[key].set_volume(self.volume)
-                except pygame.error as e:
-                    print(f"Error loading {filename}: {e}")
-            else:
-                print(f"Sound file missing: {path}")
+        # A sound triggered before it finishes decoding is simply not heard
+        assets.load_sounds({key: os.path.join(base_path, filename) for key, filename in sound_files.items()},
+                           self.add_sound)
+
+    def add_sound(self, key, sound):
+        """Sound loader thread: make a decoded sound playable"""
+        sound.set_volume(self.volume)
+        self.sounds[key] = sound
 
     def play(self, sound_key):
-        """Play a sound by its key"""
+        """Play a sound by its key on a free or stolen channel"""
         sound = self.sounds.get(sound_key)
-        if sound:
-            sound.play()
+        if not sound:
+            return
+        if sound_key in self.tick_keys:
+            self.deduped += 1
+            return
+        self.tick_keys.add(sound_key)
+
+        # Our reserved channels, then the shared pool; when all are busy steal
+        # a lower-priority (or our own) oldest voice there, else drop the sound.
+        # Another key's reserved channels are never stolen
+        priority = SOUND_CHANNELS.get(sound_key, DEFAULT_CHANNEL)["priority"]
+        candidates = self.owned.get(sound_key, []) + self.shared
+        index = self.free_channel(candidates)
+        if index is None:
+            index = self.steal_channel(candidates, sound_key, priority)
+            if index is None:
+                self.dropped += 1
+                return
+            self.channels[index].stop()
+            self.stolen += 1
+        self.channels[index].play(sound)
+        self.voices[index] = (sound_key, priority, self.started)
+        self.started += 1
+        self.played += 1
+
+    def free_channel(self, candidates):
+        for index in candidates:
+            if not self.channels[index].get_busy():
+                return index
+        return None
+
+    def steal_channel(self, candidates, sound_key, priority):
+        """Oldest voice among the lowest priorities below ours, or our own oldest"""
+        victim = None
+        for index in candidates:
+            if self.voices[index] is None:
+                return index
+            key, voice_priority, started = self.voices[index]
+            if voice_priority < priority or key == sound_key:
+                rank = (voice_priority, started)
+                if victim is None or rank < victim[0]:
+                    victim = (rank, index)
+        return victim[1] if victim else None
+
+    def new_tick(self):
+        """Start a new simulation tick: the same sound may trigger again"""
+        self.tick_keys.clear()
+
+    def stats(self):
+        return {
+            "voices": sum(1 for channel in self.channels if channel.get_busy()),
+            "played": self.played,
+            "dropped": self.dropped,
+            "stolen": self.stolen,
+            "deduped": self.deduped,
+        }
 
     def set_volume(self, volume):
         """Set volume for all sounds (0.0 to 1.0)"""
         self.volume = max(0.0, min(1.0, volume))
-        for sound in self.sounds.values():
+        for sound in list(self.sounds.values()):
             sound.set_volume(self.volume)
 
     def stop_all(self):
@@ -0,0 +1,118 @@
+import math
+import random
+import time
+import argparse
+
+
+class SpatialHash:
+    """Uniform grid over the playfield for broadphase collision queries.
+
+    Objects are bucketed by the cells their rect overlaps. Cell indices
+    wrap around the playfield edges, so asteroids drifting past the screen
+    border (they wrap at +/- radius) still land in valid buckets; the
+    exact rect test done by the caller filters any false positives.
+    Buckets keep insertion order, so querying a grid built from a list
+    yields candidates in the same order as scanning that list.
+    """
+
+    def __init__(self, width, height, cell_size=80):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cells_for_rect(self, rect):
+        size = self.cell_size
+        x0, x1 = rect.left // size, (rect.right - 1) // size
+        y0, y1 = rect.top // size, (rect.bottom - 1) // size
+        cols = range(x0, x1 + 1) if x1 - x0 < self.cols else range(self.cols)
+        rows = range(y0, y1 + 1) if y1 - y0 < self.rows else range(self.rows)
+        for cy in rows:
+            row = (cy % self.rows) * self.cols
+            for cx in cols:
+                yield row + cx % self.cols
+
+    def insert(self, obj, rect):
+        for key in self._cells_for_rect(rect):
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [obj]
+            else:
+                bucket.append(obj)
+
+    def remove(self, obj, rect):
+        for key in self._cells_for_rect(rect):
+            bucket = self.cells.get(key)
+            if bucket and obj in bucket:
+                bucket.remove(obj)
+
+    def query_point(self, x, y):
+        """Return the objects whose cells contain the point (may be empty)"""
+        size = self.cell_size
+        key = (int(y) // size % self.rows) * self.cols + int(x) // size % self.cols
+        return self.cells.get(key, ())
+
+    def query_rect(self, rect):
+        """Return the unique objects sharing a cell with the rect"""
+        found = []
+        seen = set()
+        for key in self._cells_for_rect(rect):
+            for obj in self.cells.get(key, ()):
+                if id(obj) not in seen:
+                    seen.add(id(obj))
+                    found.append(obj)
+        return found
+
+
+def _benchmark(counts, width, height, ticks):
+    import pygame
+    from asteroid import Asteroid
+
+    budget_ms = 1000.0 / 60
+    print(f"{'objects':>8} {'brute ms':>10} {'grid ms':>10} {'speedup':>8}  (60 FPS budget {budget_ms:.1f} ms)")
+    for count in counts:
+        random.seed(count)
+        asteroids = [Asteroid(random.uniform(0, width), random.uniform(0, height), random.choice([1, 2, 3]))
+                     for _ in range(count)]
+        bullets = [pygame.Vector2(random.uniform(0, width), random.uniform(0, height)) for _ in range(count)]
+
+        start = time.perf_counter()
+        for _ in range(ticks):
+            brute_hits = 0
+            for pos in bullets:
+                for asteroid in asteroids:
+                    if asteroid.rect.collidepoint(pos):
+                        brute_hits += 1
+                        break
+        brute_ms = (time.perf_counter() - start) * 1000 / ticks
+
+        grid = SpatialHash(width, height)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            grid.clear()
+            for asteroid in asteroids:
+                grid.insert(asteroid, asteroid.rect)
+            grid_hits = 0
+            for pos in bullets:
+                for asteroid in grid.query_point(pos.x, pos.y):
+                    if asteroid.rect.collidepoint(pos):
+                        grid_hits += 1
+                        break
+        grid_ms = (time.perf_counter() - start) * 1000 / ticks
+
+        assert brute_hits == grid_hits
+        print(f"{count:>8} {brute_ms:>10.3f} {grid_ms:>10.3f} {brute_ms / grid_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark brute-force vs spatial-hash bullet/asteroid tests")
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 100, 200, 400, 800],
+                        help="asteroid and bullet count per scenario")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+    _benchmark(args.counts, args.width, args.height, args.ticks)
@@ -0,0 +1,166 @@
+import sqlite3
+from datetime import datetime
+
+from leaderboard import BackgroundWriter, ScoreJournal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class SQLiteLeaderboard:
+    """Leaderboard backed by an indexed SQLite table instead of an in-memory list.
+
+    Same API as ``Leaderboard``, but nothing is loaded up front: top-k is
+    an index-ordered ``LIMIT``/``OFFSET`` query and rank is a pair of
+    indexed ``COUNT`` queries. Ties rank in insertion (``id``) order, as
+    in the JSON leaderboard. ``add_score`` writes inside the open
+    transaction and ``save`` commits it. Top-k pages are cached until
+    this or another connection writes, since the HUD asks every frame;
+    so are rank lookups.
+
+    In WAL mode with ``synchronous=NORMAL`` a commit only appends to the
+    write-ahead log; the fsync happens at checkpoints. With ``background``
+    automatic checkpoints are turned off and ``save`` asks a
+    ``BackgroundWriter`` thread to checkpoint on its own connection, so
+    the game thread never waits on the disk sync.
+
+    On first open an empty database imports ``migrate_from`` (the JSON
+    leaderboard snapshot + journal) once.
+    """
+
+    def __init__(self, filename, migrate_from=None, background=False):
+        self.filename = filename
+        self.db = sqlite3.connect(filename)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.cache = {}
+        self.data_version = None
+        if migrate_from:
+            self.migrate(migrate_from)
+        self.writer = None
+        self.writer_db = None
+        if background:
+            self.db.execute("PRAGMA wal_autocheckpoint=0")
+            self.writer = BackgroundWriter(self.checkpoint, finish=self.close_writer_db)
+
+    def migrate(self, json_filename):
+        """Import a JSON leaderboard into an empty database, once"""
+        done = self.db.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        empty = self.db.execute("SELECT NOT EXISTS (SELECT 1 FROM scores)").fetchone()[0]
+        if done or not empty:
+            return
+        journal = ScoreJournal(json_filename)
+        entries = journal.load()
+        # Sorted best-first with ties in insertion order, so ids keep tie order
+        entries.sort(key=lambda s: s["score"], reverse=True)
+        with self.db:
+            self.db.executemany("INSERT INTO scores (name, score, timestamp) VALUES (?, ?, ?)",
+                                ((e["name"], e["score"], e.get("timestamp", "")) for e in entries))
+            self.db.execute("INSERT INTO meta VALUES ('migrated_from', ?)", (json_filename,))
+        print(f"Migrated {len(entries)} scores from {json_filename} to {self.filename}")
+
+    def scalar(self, sql, *args):
+        return self.db.execute(sql, args).fetchone()[0]
+
+    def fresh_cache(self):
+        # data_version moves whenever another connection commits
+        version = self.scalar("PRAGMA data_version")
+        if version != self.data_version:
+            self.data_version = version
+            self.cache.clear()
+        return self.cache
+
+    def save(self):
+        try:
+            self.db.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving leaderboard: {e}")
+            return
+        if self.writer is not None:
+            # A full queue already has a checkpoint coming that will cover this commit
+            self.writer.submit("checkpoint")
+
+    def checkpoint(self, batches):
+        """Writer thread: sync committed transactions into the database file"""
+        try:
+            if self.writer_db is None:
+                # Connections belong to the thread that opened them
+                self.writer_db = sqlite3.connect(self.filename)
+            self.writer_db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            print(f"Error saving leaderboard: {e}")
+
+    def close_writer_db(self):
+        if self.writer_db is not None:
+            self.writer_db.close()
+            self.writer_db = None
+
+    def add_score(self, name, score):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.db.execute("INSERT INTO scores (name, score, timestamp) VALUES (?, ?, ?)",
+                        (name, score, timestamp))
+        self.cache.clear()
+
+    def get_top_scores(self, count=None, offset=0):
+        cache = self.fresh_cache()
+        key = (count, offset)
+        rows = cache.get(key)
+        if rows is None:
+            rows = cache[key] = [
+                {"name": name, "score": score, "timestamp": timestamp}
+                for name, score, timestamp in self.db.execute(
+                    "SELECT name, score, timestamp FROM scores ORDER BY score DESC, id LIMIT ? OFFSET ?",
+                    (-1 if count is None else count, offset))
+            ]
+        return rows
+
+    def get_player_rank(self, name, score):
+        """1-based rank ``score`` would take, or the rank of ``name``'s entry with it"""
+        # The game over screen asks every frame; the COUNTs scan an index range
+        cache = self.fresh_cache()
+        key = ("rank", name, score)
+        rank = cache.get(key)
+        if rank is None:
+            greater = self.scalar("SELECT COUNT(*) FROM scores WHERE score > ?", score)
+            own = self.scalar("SELECT MIN(id) FROM scores WHERE name = ? AND score = ?", name, score)
+            if own is None:
+                ties = self.scalar("SELECT COUNT(*) FROM scores WHERE score = ?", score)
+            else:
+                ties = self.scalar("SELECT COUNT(*) FROM scores WHERE score = ? AND id < ?", score, own)
+            rank = cache[key] = greater + ties + 1
+        return rank
+
+    def has_score(self, name, score):
+        return self.scalar("SELECT EXISTS (SELECT 1 FROM scores WHERE name = ? AND score = ?)",
+                           name, score) == 1
+
+    def get_player_best(self, name):
+        return self.scalar("SELECT MAX(score) FROM scores WHERE name = ?", name)
+
+    def get_high_score(self):
+        top = self.get_top_scores(1)
+        return top[0]["score"] if top else 0
+
+    def count(self):
+        return self.scalar("SELECT COUNT(*) FROM scores")
+
+    def clear_leaderboard(self):
+        with self.db:
+            self.db.execute("DELETE FROM scores")
+        self.cache.clear()
+
+    def close(self):
+        self.save()
+        if self.writer is not None:
+            self.writer.close()
+        self.db.close()
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+import pygame
+
+
+class StampCache:
+    """LRU cache of pre-rendered filled-circle surfaces ("stamps").
+
+    Glows and dots used to allocate a fresh SRCALPHA surface per element
+    per frame. Stamps are built once per (radius, color, alpha bucket)
+    and reused until they are evicted, least recently used first, once
+    the cached pixels exceed ``max_bytes``. Color channels and alpha are
+    snapped to ``color_step``/``alpha_step`` buckets so particles with
+    randomized colors still share stamps.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, alpha_step=16, color_step=16):
+        self.max_bytes = max_bytes
+        self.alpha_step = alpha_step
+        self.color_step = color_step
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _bucket(self, value, step):
+        return min(255, max(0, (int(value) + step // 2) // step * step))
+
+    def get(self, radius, color, alpha=255):
+        """Return a (2*radius)-square surface holding a circle of the given color"""
+        radius = max(0, int(radius))
+        cstep = self.color_step
+        key = (radius,
+               self._bucket(color[0], cstep), self._bucket(color[1], cstep), self._bucket(color[2], cstep),
+               self._bucket(alpha, self.alpha_step))
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        if radius:
+            pygame.draw.circle(surf, key[1:], (radius, radius), radius)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        self.entries[key] = surf
+        self.bytes += radius * radius * 16
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            (old_radius, *_), _ = self.entries.popitem(last=False)
+            self.bytes -= old_radius * old_radius * 16
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every module that draws glows and dots
+stamps = StampCache()
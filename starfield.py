@@ -0,0 +1,119 @@
+import random
+import numpy as np
+import pygame
+
+
+class Starfield:
+    """Starfield baked into a few horizontally scrolling parallax layers.
+
+    Stars are split into speed bands and each band is pre-rendered once
+    into a screen-sized, RLE colorkeyed layer; drawing is a clear plus two
+    wrapped blits per layer. A fraction of the stars twinkle: they
+    are kept out of the layers and written straight into the screen's
+    pixels with one vectorized NumPy assignment per frame.
+    """
+
+    def __init__(self, width, height, count=200, bg_color=(0, 0, 0), bands=3, twinkle_fraction=0.3):
+        self.width = width
+        self.height = height
+        self.bg_color = bg_color
+        self.bands = bands
+        self.twinkle_fraction = twinkle_fraction
+        # Own stream: regenerating mid-round must not disturb the simulation's RNG
+        self.rng = random.Random()
+        # Bands keep scrolling from where they were across rebuilds
+        self.speed_range = (0.05, 0.3)
+        band_width = (self.speed_range[1] - self.speed_range[0]) / bands
+        self.speeds = [self.speed_range[0] + band_width * (i + 0.5) for i in range(bands)]
+        self.offsets = [0.0] * bands
+        self.generate(count)
+
+    def generate(self, count):
+        """(Re)build the layers for a new star count"""
+        for _ in self.build(count):
+            pass
+
+    def build(self, count):
+        """Rebuild for a new star count one layer per step.
+
+        A generator: each ``next`` renders one band's layer, and the old
+        layers keep drawing until the last step swaps the new ones in, so
+        a mid-round rebuild can be spread over several frames.
+        """
+        width, height = self.width, self.height
+        speed_lo, speed_hi = self.speed_range
+        band_width = (speed_hi - speed_lo) / self.bands
+
+        rng = self.rng
+        stars = [[] for _ in range(self.bands)]
+        twinklers = []
+        for _ in range(count):
+            x = rng.randint(0, width - 1)
+            y = rng.randint(0, height - 1)
+            size = rng.randint(1, 2)
+            speed = rng.uniform(speed_lo, speed_hi)
+            brightness = rng.randint(120, 255)
+            band = min(self.bands - 1, int((speed - speed_lo) / band_width))
+            if rng.random() < self.twinkle_fraction:
+                twinklers.append((x, y, size, band, brightness, rng.uniform(0, 2 * np.pi)))
+            else:
+                stars[band].append((x, y, size, brightness))
+
+        layers = []
+        for band_stars in stars:
+            layer = pygame.Surface((width, height))
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()
+            layer.fill(self.bg_color)
+            layer.set_colorkey(self.bg_color, pygame.RLEACCEL)
+            for x, y, size, brightness in band_stars:
+                pygame.draw.circle(layer, (brightness,) * 3, (x, y), size)
+            layers.append(layer)
+            if len(layers) < self.bands:
+                yield
+
+        self.count = count
+        self.layers = layers
+        tw = np.array(twinklers, dtype=np.float64).reshape(-1, 6)
+        self.tw_x = tw[:, 0]
+        self.tw_y = tw[:, 1].astype(np.intp)
+        self.tw_big = tw[:, 2] > 1
+        self.tw_band = tw[:, 3].astype(np.intp)
+        self.tw_brightness = tw[:, 4]
+        self.tw_phase = tw[:, 5]
+
+    def update(self):
+        for i, speed in enumerate(self.speeds):
+            self.offsets[i] = (self.offsets[i] + speed) % self.width
+
+    def draw(self, screen, timer, twinkle=True):
+        width = self.width
+        screen.fill(self.bg_color)
+        for layer, offset in zip(self.layers, self.offsets):
+            x = -int(offset)
+            screen.blit(layer, (x, 0))
+            if x:
+                screen.blit(layer, (x + width, 0))
+
+        if len(self.tw_x):
+            if twinkle:
+                value = self.tw_brightness + 30 * np.sin(timer * 0.03 + self.tw_phase)
+                value = np.clip(value, 80, 255).astype(np.uint8)
+            else:
+                value = self.tw_brightness.astype(np.uint8)
+            self.draw_twinklers(screen, value)
+
+    def draw_twinklers(self, screen, value):
+        offsets = np.array(self.offsets)[self.tw_band]
+        xs = (self.tw_x - offsets).astype(np.intp) % self.width
+        ys = self.tw_y
+        pixels = pygame.surfarray.pixels3d(screen)
+        pixels[xs, ys] = value[:, None]
+        big = self.tw_big
+        if big.any():
+            xb, yb, vb = xs[big], ys[big], value[big][:, None]
+            pixels[np.minimum(xb + 1, self.width - 1), yb] = vb
+            pixels[xb, np.minimum(yb + 1, self.height - 1)] = vb
+            pixels[np.maximum(xb - 1, 0), yb] = vb
+            pixels[xb, np.maximum(yb - 1, 0)] = vb
+        del pixels
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import pygame
+
+SHADOW_COLOR = (0, 0, 0, 180)
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces.
+
+    Plain text is keyed by (font, text, color, antialias). Shadowed text
+    is cached as one pre-composited surface holding the shadow and the
+    text, so a static label costs a single blit per frame.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, build):
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.entries[key] = build()
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        return self._get(key, lambda: font.render(text, antialias, color))
+
+    def render_shadowed(self, font, text, color, shadow_offset=2, antialias=True):
+        """Return the text with its drop shadow baked in.
+
+        The text sits at the surface's top-left corner and the shadow at
+        ``(shadow_offset, shadow_offset)``.
+        """
+        def build():
+            text_surf = self.render(font, text, color, antialias)
+            shadow = self.render(font, text, SHADOW_COLOR, antialias)
+            w, h = text_surf.get_size()
+            combined = pygame.Surface((w + shadow_offset, h + shadow_offset), pygame.SRCALPHA)
+            combined.blit(shadow, (shadow_offset, shadow_offset))
+            combined.blit(text_surf, (0, 0))
+            return combined
+
+        key = ("shadowed", font, text, tuple(color), shadow_offset, antialias)
+        return self._get(key, build)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by the HUD, screens and bullet labels
+text_cache = TextCache()
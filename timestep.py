@@ -0,0 +1,47 @@
+import pygame
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation ticks.
+
+    Each rendered frame feeds its elapsed time into an accumulator and
+    runs as many ticks as fit, so gameplay advances at ``tick_rate`` no
+    matter how fast frames render. After a long stall at most
+    ``max_steps`` ticks run and the rest of the backlog is dropped, so one
+    hitch can't snowball into a spiral of ever-longer catch-up frames.
+    ``alpha`` is the leftover fraction of a tick, used to interpolate
+    entity positions when drawing.
+    """
+
+    def __init__(self, tick_rate=60, max_steps=5):
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, frame_time):
+        """Add a frame's elapsed seconds and return how many ticks to run"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            dropped = (steps - self.max_steps) * self.dt
+            self.accumulator -= dropped
+            self.dropped_time += dropped
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        self.alpha = self.accumulator / self.dt
+        return steps
+
+
+def lerp_position(prev, pos, alpha, max_jump=100):
+    """Interpolated draw position; snaps across screen wraps and respawns"""
+    dx = pos.x - prev.x
+    dy = pos.y - prev.y
+    if abs(dx) > max_jump or abs(dy) > max_jump:
+        return pos
+    return pygame.Vector2(prev.x + dx * alpha, prev.y + dy * alpha)
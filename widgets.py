@@ -0,0 +1,89 @@
+from collections import OrderedDict
+import pygame
+
+
+class WidgetCache:
+    """Pre-rendered UI widget surfaces keyed by size, alpha and colors.
+
+    Glass panels and progress-bar gradients are built once per key and
+    reused every frame. Progress bars keep one full-width gradient and
+    are drawn by clipping it to the filled width. The cache is bounded
+    (least recently used first) and is dropped whenever the screen
+    resolution or render scale changes, since layouts are sized from
+    them; panel borders and corners are drawn at ``scale``.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.resolution = None
+        self.scale = 1.0
+        self.hits = 0
+        self.misses = 0
+
+    def set_resolution(self, size, scale=1.0):
+        if size != self.resolution or scale != self.scale:
+            self.resolution = size
+            self.scale = scale
+            self.entries.clear()
+
+    def _get(self, key, build):
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = build()
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+    def panel(self, width, height, alpha, bg_color, border_color, highlight_color):
+        key = ("panel", width, height, alpha, bg_color, border_color, highlight_color)
+        return self._get(key, lambda: _render_panel(width, height, alpha, bg_color, border_color,
+                                                    highlight_color, self.scale))
+
+    def bar_background(self, width, height, color):
+        def build():
+            bg = pygame.Surface((width, height), pygame.SRCALPHA)
+            bg.fill(color)
+            return bg
+        return self._get(("bar_bg", width, height, color), build)
+
+    def bar_gradient(self, width, height, color_start, color_end):
+        key = ("bar", width, height, color_start, color_end)
+        return self._get(key, lambda: _render_gradient(width, height, color_start, color_end))
+
+
+def _render_panel(width, height, alpha, bg_color, border_color, highlight_color, scale=1.0):
+    panel = pygame.Surface((width, height), pygame.SRCALPHA)
+
+    # Background with gradient
+    for i in range(height):
+        gradient_factor = i / height
+        bg_alpha = int(alpha * (0.8 + 0.2 * gradient_factor))
+        pygame.draw.line(panel, (*bg_color[:3], bg_alpha), (0, i), (width, i))
+
+    # Border glow
+    pygame.draw.rect(panel, border_color, (0, 0, width, height), max(1, round(2 * scale)),
+                     border_radius=round(12 * scale))
+
+    # Inner highlight
+    inset, top = round(12 * scale), round(3 * scale)
+    pygame.draw.line(panel, highlight_color, (inset, top), (width - inset, top), 1)
+    return panel
+
+
+def _render_gradient(width, height, color_start, color_end):
+    fill = pygame.Surface((width, height), pygame.SRCALPHA)
+    for i in range(width):
+        ratio = i / width
+        r = int(color_start[0] + (color_end[0] - color_start[0]) * ratio)
+        g = int(color_start[1] + (color_end[1] - color_start[1]) * ratio)
+        b = int(color_start[2] + (color_end[2] - color_start[2]) * ratio)
+        pygame.draw.line(fill, (r, g, b), (i, 0), (i, height))
+    return fill
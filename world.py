@@ -0,0 +1,215 @@
+import io
+import pickle
+import random
+import time
+import argparse
+from player import Player
+from bullet import bullet_pool
+from asteroid import AsteroidManager
+from bullet_manager import BulletManager
+from explosion import ExplosionManager
+from spatial_hash import SpatialHash
+from particles import ParticleEngine
+from profiler import FrameProfiler
+
+# Particle colors for gameplay feedback (match the palette in main.py)
+COLOR_HIT = (255, 165, 0)
+COLOR_CRASH = (255, 69, 58)
+
+
+class _HookPickler(pickle.Pickler):
+    """Pickles hooks as references into a live World instead of by value"""
+
+    def __init__(self, file, hooks):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.hook_ids = {id(hook): name for name, hook in hooks.items() if hook is not None}
+
+    def persistent_id(self, obj):
+        return self.hook_ids.get(id(obj))
+
+
+class _HookUnpickler(pickle.Unpickler):
+    def __init__(self, file, hooks):
+        super().__init__(file)
+        self.hooks = hooks
+
+    def persistent_load(self, name):
+        return self.hooks[name]
+
+
+class World:
+    """Game simulation state that runs against explicit playfield bounds.
+
+    Nothing here touches the display, so a World can be stepped headless
+    for benchmarks, soak tests and batch simulation. Rendering and audio
+    are optional hooks: ``sound_manager`` is a callable taking a sound key
+    and ``particle_spawner`` is a callable taking ``(x, y, count, color)``.
+    Explosion, thrust and trail effects emit into ``particles``, which is
+    created here unless the caller shares its own engine. Phases are
+    timed into ``profiler`` when one is passed and enabled.
+    """
+
+    def __init__(self, width, height, hud_width=0, fps=60, round_time=30.0,
+                 bullet_font=None, sound_manager=None, particle_spawner=None, particles=None,
+                 profiler=None):
+        self.bounds = (width, height)
+        self.hud_width = hud_width
+        self.dt = 1.0 / fps
+        self.round_time = round_time
+        self.bullet_font = bullet_font
+        self.sound_manager = sound_manager
+        self.particle_spawner = particle_spawner
+        self.grid = SpatialHash(width, height)
+        self.particles = particles if particles is not None else ParticleEngine()
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.reset()
+
+    def release_entities(self):
+        """Return this round's bullets and asteroids to their pools"""
+        self.bullets.clear()
+        self.asteroids.clear()
+
+    def reset(self):
+        if "asteroids" in self.__dict__:
+            self.release_entities()
+        width, height = self.bounds
+        self.score = 0
+        self.lives = 3
+        self.time_left = self.round_time
+        self.frame = 0
+        self.game_over = False
+        self.player = Player(width//4, height//2, sound_manager=self.sound_manager,
+                             particles=self.particles)
+        self.asteroids = AsteroidManager(width - self.hud_width, height)
+        self.bullets = BulletManager(self.bullet_font, sound_manager=self.sound_manager,
+                                     particles=self.particles)
+        self.explosions = ExplosionManager(self.particles)
+        self.asteroids.spawn_initial()
+
+    def hooks(self):
+        return {
+            "bullet_font": self.bullet_font,
+            "sound_manager": self.sound_manager,
+            "particle_spawner": self.particle_spawner,
+            "particles": self.particles,
+            "profiler": self.profiler,
+        }
+
+    def snapshot(self):
+        """Serialize the simulation state together with the global RNG.
+
+        Hooks (font, sound, particle engine, profiler) are stored as
+        references and rebound to this World's own hooks by ``restore``.
+        """
+        buffer = io.BytesIO()
+        _HookPickler(buffer, self.hooks()).dump((self.__dict__, random.getstate()))
+        return buffer.getvalue()
+
+    def restore(self, data):
+        state, rng_state = _HookUnpickler(io.BytesIO(data), self.hooks()).load()
+        self.release_entities()
+        self.__dict__.update(state)
+        random.setstate(rng_state)
+
+    def play(self, sound_key):
+        if self.sound_manager:
+            self.sound_manager(sound_key)
+
+    def spawn_particles(self, x, y, count, color):
+        if self.particle_spawner:
+            self.particle_spawner(x, y, count, color)
+
+    def update(self):
+        """Advance the simulation by one frame"""
+        if self.game_over:
+            return
+
+        self.frame += 1
+        prof = self.profiler
+        with prof.phase("player"):
+            self.player.update(self.bounds)
+        with prof.phase("bullets"):
+            self.bullets.update(self.bounds)
+        with prof.phase("asteroids"):
+            self.asteroids.update(self.bounds)
+        with prof.phase("particles"):
+            self.particles.update()
+
+        if self.player.shooting:
+            bullet_info = self.player.shoot()
+            if bullet_info:
+                bullet = bullet_pool.acquire(*bullet_info, font=self.bullet_font,
+                                             sound_manager=self.sound_manager, particles=self.particles)
+                self.bullets.add(bullet)
+
+        with prof.phase("collisions"):
+            self.handle_collisions()
+        self.time_left -= self.dt
+
+        if self.lives <= 0 or self.time_left <= 0:
+            self.time_left = max(0, self.time_left)
+            self.game_over = True
+
+    def handle_collisions(self):
+        # Broadphase: bucket asteroids by grid cell so each bullet only
+        # tests the asteroids sharing its cell
+        grid = self.grid
+        grid.clear()
+        for asteroid in self.asteroids.asteroids:
+            grid.insert(asteroid, asteroid.rect)
+
+        spent = set()
+        for bullet in self.bullets.bullets:
+            for asteroid in grid.query_point(bullet.pos.x, bullet.pos.y):
+                if asteroid.rect.collidepoint(bullet.pos):
+                    self.score += asteroid.point_value
+                    self.explosions.create_explosion(asteroid.pos, asteroid.size * 10, 'asteroid')
+                    grid.remove(asteroid, asteroid.rect)
+                    for fragment in self.asteroids.destroy(asteroid):
+                        grid.insert(fragment, fragment.rect)
+                    spent.add(bullet)
+                    self.play('hit')
+                    self.spawn_particles(asteroid.pos.x, asteroid.pos.y, 12, COLOR_HIT)
+                    break
+        if spent:
+            self.bullets.remove(spent)
+
+        for asteroid in grid.query_rect(self.player.rect):
+            if asteroid.rect.colliderect(self.player.rect):
+                self.lives -= 1
+                self.explosions.create_explosion(self.player.pos, 30, 'normal')
+                self.player.respawn()
+                self.play('explosion')
+                self.spawn_particles(self.player.pos.x, self.player.pos.y, 15, COLOR_CRASH)
+                break
+
+
+def run_headless(frames, width=1920, height=1080, seed=None):
+    """Step a World with a spinning, always-firing ship and return frames/sec"""
+    if seed is not None:
+        random.seed(seed)
+    world = World(width, height, hud_width=400)
+    world.player.rotating_left = True
+    world.player.shooting = True
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        world.update()
+        if world.game_over:
+            world.reset()
+            world.player.rotating_left = True
+            world.player.shooting = True
+    elapsed = time.perf_counter() - start
+    return frames / elapsed if elapsed > 0 else float("inf")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the game simulation without a display")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fps = run_headless(args.frames, args.width, args.height, args.seed)
+    print(f"{args.frames} frames at {fps:.0f} frames/sec")